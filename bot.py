@@ -36,7 +36,19 @@ intents = discord.Intents.default()
 intents.message_content = True
 intents.members = True
 
-bot = commands.Bot(command_prefix='!', intents=intents)
+
+class MonBot(commands.Bot):
+    """Bot that releases its shared resources when it shuts down"""
+
+    async def close(self):
+        """Close the shared PokeAPI session and database pool, then disconnect"""
+        from pack_view import close_session
+        await close_session()
+        await db.close_database()
+        await super().close()
+
+
+bot = MonBot(command_prefix='!', intents=intents)
 
 # Global variables
 active_spawns = {}  # {channel_id: {'pokemon': pokemon_data, 'spawn_time': datetime}}
@@ -493,7 +505,7 @@ async def on_message(message):
             # 15% chance for a trainer to appear and claim the Pokemon (but not during rain events)
             if channel_id not in active_rains and random.random() < 0.15:
                 # Get a random trainer
-                trainer = trainer_data.get_random_trainer()
+                trainer = trainer_data.get_random_trainer(user_id=user_id)
 
                 # Get user's average Pokemon level for scaling
                 user_pokemon = await db.get_user_pokemon_for_trade(user_id, guild_id)
@@ -601,7 +613,8 @@ async def on_message(message):
                             battle_data['pokemon'],
                             pokemon_with_levels,
                             battle_data['time_taken'],
-                            battle_data.get('is_shiny', False)
+                            battle_data.get('is_shiny', False),
+                            active_trainer_battles
                         )
 
                         # Show Pokemon selection
@@ -5041,6 +5054,10 @@ class TrainerBattlePokemonSelect(View):
         self.pokemon_list = pokemon_list  # Already has levels
         self.battles_remaining = battles_remaining
 
+        # Trainers are matched to the user's average level, which stays put between battles
+        # (the chosen Pokemon's level only sets the opponent Pokemon's level)
+        self.trainer_level = sum(p['level'] for p in pokemon_list) // len(pokemon_list) if pokemon_list else 1
+
         # Pagination
         self.current_page = 0
         self.pokemon_per_page = 25
@@ -5162,8 +5179,8 @@ class TrainerBattlePokemonSelect(View):
         # Pick a random Pokemon for the trainer
         opponent_pokemon_id = random.randint(1, 386)  # Gen 1, 2 & 3 Pokemon
 
-        # Generate a random trainer with quote
-        trainer = trainer_data.get_random_trainer()
+        # Generate a random trainer with quote, matched to the user's average level
+        trainer = trainer_data.get_random_trainer(self.trainer_level, self.user.id)
 
         # Create battle view
         battle_view = SimpleTrainerBattleView(
@@ -6614,18 +6631,14 @@ async def quests(interaction: discord.Interaction):
 
         if quest_type:
             # Get quest description
-            quest_info = None
-            for variant in quest_system.QUEST_TYPES.get(quest_type, {}).get('variants', []):
-                if variant['target'] == target and variant['reward'] == reward:
-                    quest_info = variant
-                    break
+            quest_info = quest_system.get_quest(quest_type, target, reward)
 
             if quest_info:
                 status_emoji = "✅" if completed else "⏳"
                 progress_bar = f"{progress}/{target}"
 
                 # Build field value
-                field_value = f"{quest_info['description']}\n"
+                field_value = f"{quest_info.description}\n"
                 field_value += f"**Progress:** {progress_bar}\n"
                 field_value += f"**Reward:** ₽{reward}"
 
@@ -7486,13 +7499,6 @@ async def adminhelp_command(interaction: discord.Interaction):
     await interaction.followup.send(embed=embed, ephemeral=True)
 
 
-# Cleanup on shutdown
-@bot.event
-async def on_shutdown():
-    """Cleanup when bot shuts down"""
-    await db.close_database()
-
-
 # Run the bot
 if __name__ == '__main__':
     if not TOKEN:
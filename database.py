@@ -1,4 +1,5 @@
 import asyncpg
+import json
 import os
 from datetime import datetime
 from typing import List, Dict, Optional
@@ -7,6 +8,11 @@ from typing import List, Dict, Optional
 pool: Optional[asyncpg.Pool] = None
 
 
+async def _init_connection(conn):
+    """Decode JSONB columns (pack_config) to dicts instead of JSON text"""
+    await conn.set_type_codec('jsonb', encoder=json.dumps, decoder=json.loads, schema='pg_catalog')
+
+
 async def setup_database():
     """Initialize database connection and create tables"""
     global pool
@@ -20,7 +26,7 @@ async def setup_database():
     try:
         # Create connection pool
         print("Creating database connection pool...", flush=True)
-        pool = await asyncpg.create_pool(database_url, min_size=2, max_size=10)
+        pool = await asyncpg.create_pool(database_url, min_size=2, max_size=10, init=_init_connection)
         print("Database connection pool created", flush=True)
 
         # Create tables
@@ -296,6 +302,7 @@ async def close_database():
     global pool
     if pool:
         await pool.close()
+        pool = None  # Closing twice (bot shutdown, then the __main__ fallback) is a no-op
         print("Database connection pool closed")
 
 
@@ -391,10 +398,16 @@ async def add_catch(user_id: int, guild_id: int, pokemon_name: str,
         return
 
     async with pool.acquire() as conn:
-        await conn.execute('''
-            INSERT INTO catches (user_id, guild_id, pokemon_name, pokemon_id, pokemon_types, is_shiny)
-            VALUES ($1, $2, $3, $4, $5, $6)
-        ''', user_id, guild_id, pokemon_name, pokemon_id, pokemon_types, is_shiny)
+        await _insert_catch(conn, user_id, guild_id, pokemon_name, pokemon_id, pokemon_types, is_shiny)
+
+
+async def _insert_catch(conn, user_id: int, guild_id: int, pokemon_name: str,
+                        pokemon_id: int, pokemon_types: List[str], is_shiny: bool):
+    """Insert a catch row on an existing connection"""
+    await conn.execute('''
+        INSERT INTO catches (user_id, guild_id, pokemon_name, pokemon_id, pokemon_types, is_shiny)
+        VALUES ($1, $2, $3, $4, $5, $6)
+    ''', user_id, guild_id, pokemon_name, pokemon_id, pokemon_types, is_shiny)
 
 
 async def get_user_catches(user_id: int, guild_id: int) -> List[Dict]:
@@ -867,56 +880,78 @@ async def add_species_xp(user_id: int, guild_id: int, pokemon_id: int, pokemon_n
         return None
 
     async with pool.acquire() as conn:
-        # Get or create species entry
-        species = await conn.fetchrow('''
-            INSERT INTO pokemon_species_stats (user_id, guild_id, pokemon_id, pokemon_name, experience, level)
-            VALUES ($1, $2, $3, $4, $5, 1)
-            ON CONFLICT (user_id, guild_id, pokemon_id)
-            DO UPDATE SET experience = pokemon_species_stats.experience + $5
-            RETURNING *
-        ''', user_id, guild_id, pokemon_id, pokemon_name, xp_amount)
-
-        # Update win/loss count
-        if is_win:
-            await conn.execute('''
-                UPDATE pokemon_species_stats
-                SET battles_won = battles_won + 1
-                WHERE user_id = $1 AND guild_id = $2 AND pokemon_id = $3
-            ''', user_id, guild_id, pokemon_id)
-        else:
-            await conn.execute('''
-                UPDATE pokemon_species_stats
-                SET battles_lost = battles_lost + 1
-                WHERE user_id = $1 AND guild_id = $2 AND pokemon_id = $3
-            ''', user_id, guild_id, pokemon_id)
-
-        # Calculate new level (100 XP per level, no cap)
-        new_level = (species['experience'] // 100) + 1
-        old_level = species['level']
+        return await _add_species_xp(conn, user_id, guild_id, pokemon_id, pokemon_name, xp_amount, is_win)
+
+
+async def _add_species_xp(conn, user_id: int, guild_id: int, pokemon_id: int, pokemon_name: str, xp_amount: int, is_win: bool) -> Dict:
+    """Add species XP on an existing connection and handle level ups"""
+    # Get or create species entry
+    species = await conn.fetchrow('''
+        INSERT INTO pokemon_species_stats (user_id, guild_id, pokemon_id, pokemon_name, experience, level)
+        VALUES ($1, $2, $3, $4, $5, 1)
+        ON CONFLICT (user_id, guild_id, pokemon_id)
+        DO UPDATE SET experience = pokemon_species_stats.experience + $5
+        RETURNING *
+    ''', user_id, guild_id, pokemon_id, pokemon_name, xp_amount)
+
+    # Update win/loss count
+    if is_win:
+        await conn.execute('''
+            UPDATE pokemon_species_stats
+            SET battles_won = battles_won + 1
+            WHERE user_id = $1 AND guild_id = $2 AND pokemon_id = $3
+        ''', user_id, guild_id, pokemon_id)
+    else:
+        await conn.execute('''
+            UPDATE pokemon_species_stats
+            SET battles_lost = battles_lost + 1
+            WHERE user_id = $1 AND guild_id = $2 AND pokemon_id = $3
+        ''', user_id, guild_id, pokemon_id)
 
-        # Update level if it changed
-        if new_level != old_level:
-            await conn.execute('''
-                UPDATE pokemon_species_stats
-                SET level = $1
-                WHERE user_id = $2 AND guild_id = $3 AND pokemon_id = $4
-            ''', new_level, user_id, guild_id, pokemon_id)
+    # Calculate new level (100 XP per level, no cap)
+    new_level = (species['experience'] // 100) + 1
+    old_level = species['level']
 
-            return {
-                'leveled_up': True,
-                'old_level': old_level,
-                'new_level': new_level,
-                'current_xp': species['experience'],
-                'pokemon_name': pokemon_name
-            }
+    # Update level if it changed
+    if new_level != old_level:
+        await conn.execute('''
+            UPDATE pokemon_species_stats
+            SET level = $1
+            WHERE user_id = $2 AND guild_id = $3 AND pokemon_id = $4
+        ''', new_level, user_id, guild_id, pokemon_id)
 
         return {
-            'leveled_up': False,
-            'level': new_level,
+            'leveled_up': True,
+            'old_level': old_level,
+            'new_level': new_level,
             'current_xp': species['experience'],
             'pokemon_name': pokemon_name
         }
 
+    return {
+        'leveled_up': False,
+        'level': new_level,
+        'current_xp': species['experience'],
+        'pokemon_name': pokemon_name
+    }
+
+
+async def award_trainer_victory(user_id: int, guild_id: int, wild_pokemon: Dict, is_shiny: bool, reward_money: int,
+                                pokemon_id: int, pokemon_name: str, xp_amount: int) -> Dict:
+    """
+    Record a trainer battle win in one transaction: the wild Pokemon won,
+    the prize money and the battling species' XP. Returns the XP result.
+    """
+    if not pool:
+        return None
+
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            await _insert_catch(conn, user_id, guild_id, wild_pokemon['name'], wild_pokemon['id'],
+                                wild_pokemon['types'], is_shiny)
+            await _add_currency(conn, user_id, guild_id, reward_money)
+            return await _add_species_xp(conn, user_id, guild_id, pokemon_id, pokemon_name, xp_amount, is_win=True)
+
 
 # Battlepass functions (LEGACY - kept for historical data, no longer actively used)
 
@@ -946,8 +981,6 @@ async def _initialize_season1_rewards(conn):
 
 async def _initialize_shop_items(conn):
     """Initialize shop items with pack configurations"""
-    import json
-
     # Define shop items with pack configurations
     shop_items = [
         ('pack', 'Basic Pack', 'Standard pack with a few random Pokemon', 100, {
@@ -1002,7 +1035,7 @@ async def _initialize_shop_items(conn):
             INSERT INTO shop_items (item_type, item_name, description, price, pack_config)
             VALUES ($1, $2, $3, $4, $5)
             ON CONFLICT (item_name) DO NOTHING
-        ''', item_type, item_name, description, price, json.dumps(pack_config))
+        ''', item_type, item_name, description, price, pack_config)
 
 
 async def add_xp(user_id: int, guild_id: int, xp_amount: int = 10, season: int = 1):
@@ -1107,13 +1140,11 @@ async def add_pack(user_id: int, guild_id: int, pack_name: str, pack_config: dic
     if not pool:
         return
 
-    import json
-
     async with pool.acquire() as conn:
         await conn.execute('''
             INSERT INTO user_packs (user_id, guild_id, pack_name, pack_config)
             VALUES ($1, $2, $3, $4)
-        ''', user_id, guild_id, pack_name, json.dumps(pack_config))
+        ''', user_id, guild_id, pack_name, pack_config)
 
 
 async def add_packs(user_id: int, guild_id: int, pack_tier: int):
@@ -1196,6 +1227,40 @@ async def use_pack(user_id: int, guild_id: int, pack_id: int) -> Optional[Dict]:
         return dict(pack)
 
 
+async def use_packs_bulk(user_id: int, guild_id: int, pack_catches: Dict[int, List[tuple]]) -> List[int]:
+    """
+    Use several packs and record their Pokemon in one transaction.
+    pack_catches maps pack ID -> [(pokemon_name, pokemon_id, pokemon_types), ...].
+    Returns the IDs of the packs that were actually used.
+    """
+    if not pool or not pack_catches:
+        return []
+
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            rows = await conn.fetch('''
+                DELETE FROM user_packs
+                WHERE id = ANY($1) AND user_id = $2 AND guild_id = $3
+                RETURNING id
+            ''', list(pack_catches), user_id, guild_id)
+
+            used_ids = [row['id'] for row in rows]
+            records = [
+                (user_id, guild_id, pokemon_name, pokemon_id, pokemon_types)
+                for pack_id in used_ids
+                for pokemon_name, pokemon_id, pokemon_types in pack_catches[pack_id]
+            ]
+
+            if records:
+                await conn.copy_records_to_table(
+                    'catches',
+                    records=records,
+                    columns=['user_id', 'guild_id', 'pokemon_name', 'pokemon_id', 'pokemon_types']
+                )
+
+            return used_ids
+
+
 # Daily Quest functions
 
 async def get_daily_quests(user_id: int, guild_id: int) -> Optional[Dict]:
@@ -1215,8 +1280,8 @@ async def get_daily_quests(user_id: int, guild_id: int) -> Optional[Dict]:
         return dict(quests) if quests else None
 
 
-async def create_daily_quests(user_id: int, guild_id: int, quests: List[Dict]) -> bool:
-    """Create daily quests for a user"""
+async def create_daily_quests(user_id: int, guild_id: int, quests: List[tuple]) -> bool:
+    """Create daily quests for a user (quests are quest_system.Quest tuples)"""
     if not pool:
         return False
 
@@ -1234,9 +1299,9 @@ async def create_daily_quests(user_id: int, guild_id: int, quests: List[Dict]) -
             VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
             ON CONFLICT (user_id, guild_id, quest_date) DO NOTHING
         ''', user_id, guild_id, today,
-             quests[0]['type'], quests[0]['target'], quests[0]['reward'],
-             quests[1]['type'], quests[1]['target'], quests[1]['reward'],
-             quests[2]['type'], quests[2]['target'], quests[2]['reward'])
+             quests[0].type, quests[0].target, quests[0].reward,
+             quests[1].type, quests[1].target, quests[1].reward,
+             quests[2].type, quests[2].target, quests[2].reward)
 
         return True
 
@@ -1327,18 +1392,23 @@ async def add_currency(user_id: int, guild_id: int, amount: int) -> int:
         return 0
 
     async with pool.acquire() as conn:
-        result = await conn.fetchrow('''
-            INSERT INTO user_currency (user_id, guild_id, balance, total_earned)
-            VALUES ($1, $2, $3, $3)
-            ON CONFLICT (user_id, guild_id)
-            DO UPDATE SET
-                balance = user_currency.balance + $3,
-                total_earned = user_currency.total_earned + $3,
-                last_updated = NOW()
-            RETURNING balance
-        ''', user_id, guild_id, amount)
-
-        return result['balance'] if result else 0
+        return await _add_currency(conn, user_id, guild_id, amount)
+
+
+async def _add_currency(conn, user_id: int, guild_id: int, amount: int) -> int:
+    """Add currency on an existing connection. Returns new balance."""
+    result = await conn.fetchrow('''
+        INSERT INTO user_currency (user_id, guild_id, balance, total_earned)
+        VALUES ($1, $2, $3, $3)
+        ON CONFLICT (user_id, guild_id)
+        DO UPDATE SET
+            balance = user_currency.balance + $3,
+            total_earned = user_currency.total_earned + $3,
+            last_updated = NOW()
+        RETURNING balance
+    ''', user_id, guild_id, amount)
+
+    return result['balance'] if result else 0
 
 
 async def spend_currency(user_id: int, guild_id: int, amount: int) -> bool:
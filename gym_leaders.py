@@ -1,6 +1,8 @@
 # Gym Leader System
 # Gen 1 Gym Leaders with preset teams
 
+from types import MappingProxyType
+
 GYM_LEADERS = {
     'brock': {
         'name': 'Brock',
@@ -581,31 +583,45 @@ GYM_LEADERS_HOENN = {
 GYM_ORDER_HOENN = ['roxanne', 'brawly', 'wattson', 'flannery', 'norman', 'winona', 'tate_liza', 'wallace']
 
 
+def _freeze(value):
+    """Recursively turn dicts into read-only mappings and lists into tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+# Frozen views built once at import so callers can share them safely
+_KANTO_GYMS = tuple((key, _freeze(GYM_LEADERS[key])) for key in GYM_ORDER)
+_JOHTO_GYMS = tuple((key, _freeze(GYM_LEADERS_JOHTO[key])) for key in GYM_ORDER_JOHTO)
+_HOENN_GYMS = tuple((key, _freeze(GYM_LEADERS_HOENN[key])) for key in GYM_ORDER_HOENN)
+
+# Earlier regions win if a key is ever reused
+_ALL_GYMS = MappingProxyType(dict(_HOENN_GYMS + _JOHTO_GYMS + _KANTO_GYMS))
+_GYM_COUNT = len(GYM_LEADERS) + len(GYM_LEADERS_JOHTO) + len(GYM_LEADERS_HOENN)
+
+
 def get_gym_leader(gym_key: str):
     """Get gym leader data by key from any region"""
-    key = gym_key.lower()
-    if key in GYM_LEADERS:
-        return GYM_LEADERS[key]
-    if key in GYM_LEADERS_JOHTO:
-        return GYM_LEADERS_JOHTO[key]
-    return GYM_LEADERS_HOENN.get(key)
+    return _ALL_GYMS.get(gym_key.lower())
 
 
 def get_all_gym_leaders():
     """Get all Kanto gym leaders in order"""
-    return [(key, GYM_LEADERS[key]) for key in GYM_ORDER]
+    return _KANTO_GYMS
 
 
 def get_all_gym_leaders_johto():
     """Get all Johto gym leaders in order"""
-    return [(key, GYM_LEADERS_JOHTO[key]) for key in GYM_ORDER_JOHTO]
+    return _JOHTO_GYMS
 
 
 def get_all_gym_leaders_hoenn():
     """Get all Hoenn gym leaders in order"""
-    return [(key, GYM_LEADERS_HOENN[key]) for key in GYM_ORDER_HOENN]
+    return _HOENN_GYMS
 
 
 def get_gym_count():
     """Get total number of gyms across all regions"""
-    return len(GYM_LEADERS) + len(GYM_LEADERS_JOHTO) + len(GYM_LEADERS_HOENN)
+    return _GYM_COUNT
@@ -6,28 +6,81 @@ import discord
 from discord.ui import View, Button, Select
 import json
 import random
+from collections import defaultdict
+from functools import lru_cache
+from typing import Optional
 import aiohttp
 import database as db
 import pokemon_data_loader as poke_data
 
+# Shared PokeAPI session, only created if a local data lookup misses
+_SESSION: Optional[aiohttp.ClientSession] = None
+
+# Legendary Pokemon that can be pulled from packs
+LEGENDARY_IDS = frozenset({144, 145, 146, 150, 151})
+_LEGENDARY_CHOICES = tuple(sorted(LEGENDARY_IDS))  # random.choice needs a sequence
+
+# Pokemon IDs that can be pulled from packs (Gen 1 only)
+PACK_POKEMON_IDS = range(1, 152)
+
+# Embed color for each pack type
+_PACK_COLORS = {
+    'Basic Pack': discord.Color.light_grey(),
+    'Booster Pack': discord.Color.green(),
+    'Premium Pack': discord.Color.blue(),
+    'Elite Trainer Pack': discord.Color.purple(),
+    'Master Collection': discord.Color.gold()
+}
+_DEFAULT_PACK_COLOR = discord.Color.gold()
+_SHINY_PACK_COLOR = discord.Color.purple()
+
+
+@lru_cache(maxsize=256)
+def parse_pack_config(raw: str):
+    """Parse a pack_config stored as JSON text (legacy rows only - JSONB is decoded by the pool)"""
+    return json.loads(raw)
+
+
+def format_pokemon_line(pokemon: dict, is_shiny: bool, is_legendary: bool) -> str:
+    """Format a pulled Pokemon as '#025 Pikachu' plus shiny/legendary markers"""
+    markers = (" ✨" if is_shiny else "") + (" 👑" if is_legendary else "")
+    return f"#{pokemon['id']:03d} {pokemon['name']}{markers}"
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """Get the shared PokeAPI session, creating it on first use"""
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        connector = aiohttp.TCPConnector(limit=10, ttl_dns_cache=300)
+        _SESSION = aiohttp.ClientSession(connector=connector)
+    return _SESSION
+
+
+async def close_session():
+    """Close the shared PokeAPI session (called on bot shutdown)"""
+    global _SESSION
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+    _SESSION = None
+
+
+def get_local_pokemon(pokemon_id: int):
+    """Look up a Pokemon in the local data file. Returns None if it isn't there."""
+    pokemon_data = poke_data.get_pokemon(pokemon_id)
+    if pokemon_data:
+        return {
+            'id': pokemon_data['id'],
+            'name': pokemon_data['name'].title(),
+            'types': list(pokemon_data.get('types', ['normal']))
+        }
+    return None
+
 
 async def fetch_pokemon(session, pokemon_id=None):
     """Fetch a random or specific Pokemon from PokeAPI"""
     if pokemon_id is None:
         pokemon_id = random.randint(1, 151)  # Gen 1 only
 
-    try:
-        pokemon_data = poke_data.get_pokemon_data(pokemon_id)
-        if pokemon_data:
-            return {
-                'id': pokemon_data['id'],
-                'name': pokemon_data['name'].title(),
-                'types': [t['type']['name'] for t in pokemon_data['types']]
-            }
-    except:
-        pass
-
-    # Fallback to API
     try:
         async with session.get(f'https://pokeapi.co/api/v2/pokemon/{pokemon_id}') as response:
             if response.status == 200:
@@ -51,28 +104,37 @@ class PackSelectionView(View):
         self.user = user
         self.guild_id = guild_id
         self.user_packs = user_packs
+        self._remaining_count = len(user_packs)  # Kept in sync as packs are opened
 
-        # Parse all pack configs
+        # Pack configs arrive as dicts from the JSONB column
         self.parsed_packs = []
         for pack in user_packs:
-            config = None
-            if isinstance(pack['pack_config'], str):
+            config = pack['pack_config']
+            if isinstance(config, str):
                 try:
-                    config = json.loads(pack['pack_config'])
+                    config = parse_pack_config(config)
                 except (json.JSONDecodeError, TypeError):
                     continue
-            elif isinstance(pack['pack_config'], dict):
-                config = pack['pack_config']
-            else:
-                continue
 
             if config and isinstance(config, dict):
                 self.parsed_packs.append({**pack, 'parsed_config': config})
 
         # Add dropdown for pack selection
+        self.pack_select = None
         if self.parsed_packs:
             self.create_pack_dropdown()
 
+    async def get_pokemon(self, pokemon_id=None):
+        """Get a Pokemon from local data, falling back to PokeAPI"""
+        if pokemon_id is None:
+            pokemon_id = random.randint(1, 151)  # Gen 1 only
+
+        pokemon = get_local_pokemon(pokemon_id)
+        if pokemon:
+            return pokemon
+
+        return await fetch_pokemon(await get_session(), pokemon_id)
+
     def create_inventory_embed(self):
         """Create embed showing all available packs"""
         embed = discord.Embed(
@@ -81,25 +143,27 @@ class PackSelectionView(View):
             color=discord.Color.blue()
         )
 
-        # Group packs by type and count them
-        pack_counts = {}
+        # Group packs by type and count them (first config seen wins)
+        pack_counts = defaultdict(lambda: {'count': 0, 'config': None})
         for pack in self.parsed_packs:
-            name = pack['pack_name']
-            if name not in pack_counts:
-                pack_counts[name] = {'count': 0, 'config': pack['parsed_config']}
-            pack_counts[name]['count'] += 1
+            entry = pack_counts[pack['pack_name']]
+            entry['count'] += 1
+            if entry['config'] is None:
+                entry['config'] = pack['parsed_config']
 
         # Show pack inventory
-        inventory_text = ""
+        parts = []
         for pack_name, data in pack_counts.items():
             config = data['config']
-            count = data['count']
             min_poke = config.get('min_pokemon', 0)
             max_poke = config.get('max_pokemon', 0)
             shiny = config.get('shiny_chance', 0) * 100
 
-            inventory_text += f"**{pack_name}** ×{count}\n"
-            inventory_text += f"└ {min_poke}-{max_poke} Pokemon • {shiny}% shiny chance\n\n"
+            parts.append(
+                f"**{pack_name}** ×{data['count']}\n"
+                f"└ {min_poke}-{max_poke} Pokemon • {shiny}% shiny chance\n\n"
+            )
+        inventory_text = ''.join(parts)
 
         embed.add_field(
             name="📋 Pack Inventory",
@@ -112,23 +176,32 @@ class PackSelectionView(View):
         return embed
 
     def create_pack_dropdown(self):
-        """Create dropdown menu for pack selection"""
+        """Create (or rebuild) the dropdown menu for pack selection"""
+        # Replace the previous dropdown so the counts stay current
+        if self.pack_select is not None:
+            self.remove_item(self.pack_select)
+            self.pack_select = None
+
         options = []
-        added_pack_ids = []
-
-        for pack in self.parsed_packs[:25]:  # Discord limit
-            # Add each unique pack
-            if pack['id'] not in added_pack_ids:
-                config = pack['parsed_config']
-                label = f"{pack['pack_name']}"
-                desc = f"{config.get('min_pokemon', 0)}-{config.get('max_pokemon', 0)} Pokemon"
-
-                options.append(discord.SelectOption(
-                    label=label[:100],
-                    value=str(pack['id']),
-                    description=desc[:100]
-                ))
-                added_pack_ids.append(pack['id'])
+
+        # One option per pack type - pack IDs are unique, so group by name instead
+        pack_types = {}
+        for pack in self.parsed_packs:
+            if pack['pack_name'] in pack_types:
+                pack_types[pack['pack_name']][1] += 1
+            else:
+                pack_types[pack['pack_name']] = [pack, 1]
+
+        for pack, count in list(pack_types.values())[:25]:  # Discord limit
+            config = pack['parsed_config']
+            label = f"{pack['pack_name']} ×{count}"
+            desc = f"{config.get('min_pokemon', 0)}-{config.get('max_pokemon', 0)} Pokemon"
+
+            options.append(discord.SelectOption(
+                label=label[:100],
+                value=pack['pack_name'],  # The next unopened pack of this type is picked on selection
+                description=desc[:100]
+            ))
 
         if options:
             pack_select = Select(
@@ -137,6 +210,7 @@ class PackSelectionView(View):
             )
             pack_select.callback = self.pack_selected
             self.add_item(pack_select)
+            self.pack_select = pack_select
 
     @discord.ui.button(label="📦 Open All Packs", style=discord.ButtonStyle.success, row=1)
     async def open_all_button(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -148,24 +222,40 @@ class PackSelectionView(View):
         await interaction.response.defer()
 
         # Open all packs
-        all_pokemon = []
+        total_pokemon = 0
+        pokemon_list = []  # Sample of the first 15 for the embed
         total_shinies = 0
         total_legendaries = 0
         packs_opened = 0
-        legendary_ids = [144, 145, 146, 150, 151]
+
+        # Roll every pack first, then use the packs and record the catches in one transaction
+        pack_results = {}
+        for pack in self.parsed_packs:
+            pack_results[pack['id']] = await self.roll_pack(pack['parsed_config'])
+
+        used_ids = set(await db.use_packs_bulk(self.user.id, self.guild_id, {
+            pack_id: [(p['name'], p['id'], p['types']) for p in result['pokemon']]
+            for pack_id, result in pack_results.items()
+        }))
 
         for pack in self.parsed_packs:
-            pack_result = await self.open_pack(pack['id'], pack['parsed_config'])
-            if pack_result:
-                all_pokemon.extend(pack_result['pokemon'])
-                total_shinies += sum(1 for p in pack_result['pokemon'] if p.get('is_shiny'))
-                total_legendaries += sum(1 for p in pack_result['pokemon'] if p['id'] in legendary_ids)
+            if pack['id'] in used_ids:
+                for p in pack_results[pack['id']]['pokemon']:
+                    is_shiny = bool(p.get('is_shiny'))
+                    is_legendary = p['id'] in LEGENDARY_IDS
+                    total_shinies += is_shiny
+                    total_legendaries += is_legendary
+                    if total_pokemon < 15:
+                        pokemon_list.append(format_pokemon_line(p, is_shiny, is_legendary))
+                    total_pokemon += 1
                 packs_opened += 1
 
+        self._remaining_count = max(0, self._remaining_count - packs_opened)
+
         # Create summary embed
         embed = discord.Embed(
             title=f"🎉 Opened {packs_opened} Packs!",
-            description=f"You received **{len(all_pokemon)} Pokemon**!",
+            description=f"You received **{total_pokemon} Pokemon**!",
             color=discord.Color.gold()
         )
 
@@ -176,20 +266,10 @@ class PackSelectionView(View):
             embed.add_field(name="👑 Legendaries", value=f"**{total_legendaries}** legendary Pokemon!", inline=True)
 
         # Show sample of Pokemon (first 15)
-        if all_pokemon:
-            sample = all_pokemon[:15]
-            pokemon_list = []
-            for p in sample:
-                markers = ""
-                if p.get('is_shiny'):
-                    markers += " ✨"
-                if p['id'] in legendary_ids:
-                    markers += " 👑"
-                pokemon_list.append(f"#{p['id']:03d} {p['name']}{markers}")
-
+        if pokemon_list:
             pokemon_text = "\n".join(pokemon_list)
-            if len(all_pokemon) > 15:
-                pokemon_text += f"\n\n... and {len(all_pokemon) - 15} more!"
+            if total_pokemon > 15:
+                pokemon_text += f"\n\n... and {total_pokemon - 15} more!"
 
             embed.add_field(name="🎁 Pokemon Received", value=pokemon_text, inline=False)
 
@@ -207,43 +287,45 @@ class PackSelectionView(View):
 
         await interaction.response.defer()
 
-        # Get selected pack ID
-        pack_id = int(interaction.data['values'][0])
-
-        # Find the pack config
-        pack = next((p for p in self.parsed_packs if p['id'] == pack_id), None)
+        # Take the next unopened pack of the selected type
+        pack_name = interaction.data['values'][0]
+        pack = next((p for p in self.parsed_packs if p['pack_name'] == pack_name), None)
         if not pack:
             await interaction.followup.send("❌ Pack not found!", ephemeral=True)
             return
 
-        # Open the pack
-        result = await self.open_pack(pack_id, pack['parsed_config'])
+        # Open the pack - it's used up either way, so drop it and refresh the dropdown counts
+        result = await self.open_pack(pack['id'], pack['parsed_config'])
+        self.parsed_packs.remove(pack)
+        self.create_pack_dropdown()
+        await interaction.message.edit(view=self)
 
         if not result:
             await interaction.followup.send("❌ Failed to open pack!", ephemeral=True)
             return
 
+        self._remaining_count = max(0, self._remaining_count - 1)
+
+        # List Pokemon, counting shinies and legendaries in the same pass
+        pokemon_list = []
+        has_shiny = False
+        legendary_count = 0
+        for p in result['pokemon']:
+            is_shiny = bool(p.get('is_shiny'))
+            is_legendary = p['id'] in LEGENDARY_IDS
+            has_shiny = has_shiny or is_shiny
+            legendary_count += is_legendary
+            pokemon_list.append(format_pokemon_line(p, is_shiny, is_legendary))
+
         # Create result embed
         is_mega = result.get('is_mega', False)
-        has_shiny = any(p.get('is_shiny') for p in result['pokemon'])
-        legendary_ids = [144, 145, 146, 150, 151]
-        legendary_count = sum(1 for p in result['pokemon'] if p['id'] in legendary_ids)
 
         title = "🎉 MEGA PACK! 🎉" if is_mega else f"📦 {pack['pack_name']} Opened!"
         if has_shiny:
             title = "✨ SHINY PACK! ✨"
 
         # Color based on pack type
-        colors = {
-            'Basic Pack': discord.Color.light_grey(),
-            'Booster Pack': discord.Color.green(),
-            'Premium Pack': discord.Color.blue(),
-            'Elite Trainer Pack': discord.Color.purple(),
-            'Master Collection': discord.Color.gold()
-        }
-        color = colors.get(pack['pack_name'], discord.Color.gold())
-        if has_shiny:
-            color = discord.Color.purple()
+        color = _SHINY_PACK_COLOR if has_shiny else _PACK_COLORS.get(pack['pack_name'], _DEFAULT_PACK_COLOR)
 
         embed = discord.Embed(
             title=title,
@@ -251,16 +333,6 @@ class PackSelectionView(View):
             color=color
         )
 
-        # List Pokemon
-        pokemon_list = []
-        for p in result['pokemon']:
-            markers = ""
-            if p.get('is_shiny'):
-                markers += " ✨"
-            if p['id'] in legendary_ids:
-                markers += " 👑"
-            pokemon_list.append(f"#{p['id']:03d} {p['name']}{markers}")
-
         # Display in columns if needed
         if len(pokemon_list) <= 10:
             embed.add_field(name="Pokemon Caught", value='\n'.join(pokemon_list), inline=False)
@@ -282,7 +354,7 @@ class PackSelectionView(View):
         await db.update_quest_progress(self.user.id, self.guild_id, 'open_packs')
 
         # Show remaining packs
-        remaining = await db.get_pack_count(self.user.id, self.guild_id)
+        remaining = self._remaining_count
         pack_word = 'pack' if remaining == 1 else 'packs'
         embed.set_footer(text=f"Remaining packs: {remaining} {pack_word}")
 
@@ -296,6 +368,22 @@ class PackSelectionView(View):
         if not pack_data:
             return None
 
+        result = await self.roll_pack(config)
+
+        # Add to user's collection
+        for pokemon in result['pokemon']:
+            await db.add_catch(
+                user_id=self.user.id,
+                guild_id=self.guild_id,
+                pokemon_name=pokemon['name'],
+                pokemon_id=pokemon['id'],
+                pokemon_types=pokemon['types']
+            )
+
+        return result
+
+    async def roll_pack(self, config: dict):
+        """Roll the Pokemon inside a pack without touching the database"""
         # Determine pack size
         min_poke = config.get('min_pokemon', 3)
         max_poke = config.get('max_pokemon', 5)
@@ -310,42 +398,34 @@ class PackSelectionView(View):
         else:
             pack_size = random.randint(min_poke, max_poke)
 
+        # Read the pack odds once and draw all the random IDs up front
+        guaranteed_rare = config.get('guaranteed_rare')
+        guaranteed_rare_count = config.get('guaranteed_rare_count', 1)
+        forced_legendary_chance = config.get('legendary_chance', 0.1) * 2
+        shiny_chance = config.get('shiny_chance', 0.01)
+        roll = random.random
+        pokemon_ids = random.choices(PACK_POKEMON_IDS, k=pack_size)
+
         # Generate Pokemon
         pokemon_list = []
         legendary_count = 0
-        legendary_ids = [144, 145, 146, 150, 151]
-
-        async with aiohttp.ClientSession() as session:
-            for _ in range(pack_size):
-                # Check for forced legendary
-                force_legendary = False
-                if config.get('guaranteed_rare') and legendary_count < config.get('guaranteed_rare_count', 1):
-                    if random.random() < config.get('legendary_chance', 0.1) * 2:
-                        force_legendary = True
-
-                if force_legendary:
-                    pokemon_id = random.choice(legendary_ids)
-                    pokemon = await fetch_pokemon(session, pokemon_id)
-                else:
-                    pokemon = await fetch_pokemon(session)
-
-                if pokemon:
-                    # Shiny check
-                    pokemon['is_shiny'] = random.random() < config.get('shiny_chance', 0.01)
-
-                    if pokemon['id'] in legendary_ids:
-                        legendary_count += 1
-
-                    pokemon_list.append(pokemon)
-
-                    # Add to user's collection
-                    await db.add_catch(
-                        user_id=self.user.id,
-                        guild_id=self.guild_id,
-                        pokemon_name=pokemon['name'],
-                        pokemon_id=pokemon['id'],
-                        pokemon_types=pokemon['types']
-                    )
+
+        for pokemon_id in pokemon_ids:
+            # Check for forced legendary
+            if guaranteed_rare and legendary_count < guaranteed_rare_count:
+                if roll() < forced_legendary_chance:
+                    pokemon_id = random.choice(_LEGENDARY_CHOICES)
+
+            pokemon = await self.get_pokemon(pokemon_id)
+
+            if pokemon:
+                # Shiny check
+                pokemon['is_shiny'] = roll() < shiny_chance
+
+                if pokemon['id'] in LEGENDARY_IDS:
+                    legendary_count += 1
+
+                pokemon_list.append(pokemon)
 
         return {
             'pokemon': pokemon_list,
@@ -5,33 +5,209 @@ Pokemon data sourced from PokeAPI (https://pokeapi.co)
 PokeAPI is licensed under BSD 3-Clause License
 """
 
-import json
+import mmap
 import random
-from typing import Dict, List, Optional
-
-# Load Pokemon data once at module import
-POKEMON_DATA: Dict = {}
+import re
+import sys
+import threading
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from orjson import loads as _json_loads
+    _PARSE_FROM_BUFFER = True  # orjson can parse straight from a memoryview
+except ImportError:  # orjson is optional - the stdlib parser is just slower
+    from json import loads as _json_loads
+    _PARSE_FROM_BUFFER = False
+
+# Pokemon data keyed by int Pokemon ID - loaded on first use
+POKEMON_DATA: Dict[int, Dict] = {}
+_loaded = False
+_load_lock = threading.Lock()
+
+# Entries are decoded on first use straight out of a read-only mmap of the data file
+_data_map: Optional[mmap.mmap] = None
+_entry_spans: Dict[int, Tuple[int, int]] = {}  # Pokemon ID -> (start, end) byte offsets
+# Top-level keys in the indent=2 JSON written by the fetch scripts
+_ENTRY_KEY_RE = re.compile(rb'^  "(\d+)": ', re.M)
+
+# Damage classes that make a move an attack
+_ATTACK_CLASSES = frozenset({'physical', 'special'})
+
+# Move name tokens used to sort status moves into buffs and debuffs
+BUFF_KEYWORDS = frozenset({'raise', 'increase', 'sharpen', 'harden', 'defense', 'agility', 'swords', 'dance', 'bulk', 'calm', 'mind'})
+DEBUFF_KEYWORDS = frozenset({'lower', 'reduce', 'poison', 'paralyze', 'burn', 'freeze', 'confuse', 'sleep', 'stun', 'disable'})
+
+
+# Fallback moveset when a Pokemon isn't in the local data
+_DEFAULT_MOVESET = (
+    {'name': 'Tackle', 'power': 40, 'accuracy': 100, 'type': 'normal', 'damage_class': 'physical'},
+    {'name': 'Scratch', 'power': 40, 'accuracy': 100, 'type': 'normal', 'damage_class': 'physical'},
+    {'name': 'Growl', 'power': 0, 'accuracy': 100, 'type': 'normal', 'damage_class': 'status'},
+    {'name': 'Tail Whip', 'power': 0, 'accuracy': 100, 'type': 'normal', 'damage_class': 'status'}
+)
+
+# Type-appropriate first move for Pokemon with no moves in the data
+_TYPE_DEFAULT_MOVES = {
+    'fire': {'name': 'Ember', 'power': 40, 'accuracy': 100, 'type': 'fire', 'damage_class': 'special'},
+    'water': {'name': 'Water Gun', 'power': 40, 'accuracy': 100, 'type': 'water', 'damage_class': 'special'},
+    'grass': {'name': 'Vine Whip', 'power': 45, 'accuracy': 100, 'type': 'grass', 'damage_class': 'physical'},
+    'electric': {'name': 'Thunder Shock', 'power': 40, 'accuracy': 100, 'type': 'electric', 'damage_class': 'special'},
+    'psychic': {'name': 'Confusion', 'power': 50, 'accuracy': 100, 'type': 'psychic', 'damage_class': 'special'},
+}
+
+# Moveset strategies for get_pokemon_moves, as
+# (attack counts to pick from, attacks needed for those counts, status slots kept when short on attacks)
+# None means a completely random moveset
+_MOVESET_STRATEGIES = (
+    ((3, 4), 3, 0),  # 35% - All-out attacker (3-4 attacks)
+    ((2, 3), 2, 1),  # 35% - Balanced (2-3 attacks, 1-2 status)
+    ((1, 2), 1, 0),  # 20% - Status specialist (1-2 attacks, 2-3 status)
+    None,            # 10% - Completely random
+)
+_MOVESET_STRATEGY_CUM_WEIGHTS = (35, 70, 90, 100)
+
+
+def _keyword_pattern(keywords) -> re.Pattern:
+    """Compile a regex matching any keyword as a whole hyphen-separated token of a move name"""
+    return re.compile(r'(?:^|-)(?:' + '|'.join(map(re.escape, sorted(keywords))) + r')(?:-|$)')
+
+
+_BUFF_RE = _keyword_pattern(BUFF_KEYWORDS)
+_DEBUFF_RE = _keyword_pattern(DEBUFF_KEYWORDS)
+
+# (first ID, last ID) for each generation, in order
+_GENERATION_RANGES = (
+    (1, 151),
+    (152, 251),
+    (252, 386),
+    (387, 493),
+    (494, 649),
+    (650, 721),
+    (722, 809),
+    (810, 905),
+    (906, 1025)
+)
+# Last ID of generations 1-8 - anything past these is generation 9
+_GENERATION_LAST_IDS = tuple(last for _, last in _GENERATION_RANGES[:-1])
+
+# Official artwork - better quality than the default sprites
+SPRITE_BASE_URL = "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/other/official-artwork"
+MAX_POKEMON_ID = _GENERATION_RANGES[-1][1]
+
+# Sprite URLs for every known ID, indexed by pokemon_id - 1
+_SPRITES = tuple(f"{SPRITE_BASE_URL}/{i}.png" for i in range(1, MAX_POKEMON_ID + 1))
+_SHINY_SPRITES = tuple(f"{SPRITE_BASE_URL}/shiny/{i}.png" for i in range(1, MAX_POKEMON_ID + 1))
+
+# Compact record for a learnable move, built from the raw JSON dicts at load time
+# display_name is the name formatted for battles ('thunder-shock' -> 'Thunder Shock')
+Move = namedtuple('Move', 'name power accuracy type damage_class learn_level display_name')
 
 def load_pokemon_data():
     """Load Pokemon data from local JSON file"""
-    global POKEMON_DATA
+    with _load_lock:
+        _load_pokemon_data()
+
+
+def _load_pokemon_data():
+    """Read the data file and publish it - callers must hold _load_lock"""
+    global POKEMON_DATA, _loaded, _data_map, _entry_spans
+    old_map = _data_map
+    mm = data_map = None
+    spans, pokemon_data = {}, {}
     try:
-        with open('pokemon_data.json', 'r', encoding='utf-8') as f:
-            POKEMON_DATA = json.load(f)
-        print(f"[OK] Loaded {len(POKEMON_DATA)} Pokemon from local data")
+        # The mmap keeps its own handle, so the file itself is closed right away
+        with open('pokemon_data.json', 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        spans = _index_entries(mm)
+        if spans:
+            data_map = mm
+        else:
+            # Not laid out the way the fetch scripts write it - decode everything up front
+            with mm:
+                data = _parse_buffer(mm)
+            pokemon_data = {int(key): pokemon for key, pokemon in data.items()}
+            for pokemon in pokemon_data.values():
+                _preprocess_pokemon(pokemon)
+        print(f"[OK] Loaded {len(spans) or len(pokemon_data)} Pokemon from local data")
     except FileNotFoundError:
         print("[WARNING] pokemon_data.json not found. Run: python fetch_pokemon_data.py")
-        POKEMON_DATA = {}
     except Exception as e:
         print(f"[ERROR] Error loading Pokemon data: {e}")
-        POKEMON_DATA = {}
+        if mm is not None:
+            mm.close()
+        data_map, spans, pokemon_data = None, {}, {}
+    finally:
+        # Publish the data before marking it loaded, so other threads never see a half-loaded state
+        # (set even on failure - don't retry a missing or broken file on every lookup)
+        POKEMON_DATA, _data_map, _entry_spans = pokemon_data, data_map, spans
+        get_pokemon_types.cache_clear()
+        get_pokemon_name.cache_clear()
+        _categorize_moves.cache_clear()
+        _loaded = True
+        # Lazy decodes also hold _load_lock, so nothing can still be reading the old map
+        if old_map is not None:
+            old_map.close()
+
+
+def _index_entries(mm: mmap.mmap) -> Dict[int, Tuple[int, int]]:
+    """Find the byte span of each top-level entry without decoding any of them"""
+    starts = [(int(match.group(1)), match.end()) for match in _ENTRY_KEY_RE.finditer(mm)]
+    spans = {}
+    for index, (pokemon_id, start) in enumerate(starts):
+        # An entry ends at the last '}' before the next key (or before the closing brace of the file)
+        limit = starts[index + 1][1] if index + 1 < len(starts) else mm.rfind(b'}')
+        spans[pokemon_id] = (start, mm.rfind(b'}', start, limit) + 1)
+    return spans
+
+
+def _parse_buffer(mm: mmap.mmap):
+    """Parse a whole mapped JSON file, without copying it when the parser supports buffers"""
+    if not _PARSE_FROM_BUFFER:
+        return _json_loads(mm[:])
+
+    if hasattr(mmap, 'MADV_WILLNEED'):  # Not available on Windows
+        mm.madvise(mmap.MADV_WILLNEED)
+    with memoryview(mm) as buf:
+        return _json_loads(buf)
+
+
+def _decode_entry(pokemon_id: int) -> Optional[Dict]:
+    """Decode and preprocess one Pokemon from the mapped data file"""
+    # Under the load lock so a reload can't close the map mid-read (and two threads don't decode the same ID)
+    with _load_lock:
+        pokemon = POKEMON_DATA.get(pokemon_id)
+        if pokemon is None:
+            span = _entry_spans.get(pokemon_id)
+            if span is None:
+                return None
+            pokemon = _json_loads(_data_map[span[0]:span[1]])
+            _preprocess_pokemon(pokemon)
+            POKEMON_DATA[pokemon_id] = pokemon
+        return pokemon
+
+
+def _ensure_loaded():
+    """Load the data file the first time it is needed"""
+    if not _loaded:
+        with _load_lock:
+            if not _loaded:  # Another thread may have loaded it while we waited
+                _load_pokemon_data()
 
 
 def get_pokemon(pokemon_id: int) -> Optional[Dict]:
     """Get Pokemon data by ID from local storage"""
-    return POKEMON_DATA.get(str(pokemon_id))
+    _ensure_loaded()
+    pokemon = POKEMON_DATA.get(pokemon_id)
+    if pokemon is None and pokemon_id in _entry_spans:
+        pokemon = _decode_entry(pokemon_id)
+    return pokemon
 
 
+@lru_cache(maxsize=2048)
 def get_pokemon_types(pokemon_id: int) -> List[str]:
     """Get Pokemon types"""
     pokemon = get_pokemon(pokemon_id)
@@ -50,11 +226,137 @@ def get_pokemon_stats(pokemon_id: int) -> Dict:
 
 def get_pokemon_sprite(pokemon_id: int, shiny: bool = False) -> Optional[str]:
     """Get Pokemon sprite URL - using official artwork for better quality"""
-    base_url = "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/other/official-artwork"
+    if 1 <= pokemon_id <= MAX_POKEMON_ID:
+        return (_SHINY_SPRITES if shiny else _SPRITES)[pokemon_id - 1]
 
     if shiny:
-        return f"{base_url}/shiny/{pokemon_id}.png"
-    return f"{base_url}/{pokemon_id}.png"
+        return f"{SPRITE_BASE_URL}/shiny/{pokemon_id}.png"
+    return f"{SPRITE_BASE_URL}/{pokemon_id}.png"
+
+
+def _categorize_move(move: Move) -> str:
+    """Return the pool a move belongs to: 'attacking', 'buffs', 'debuffs' or 'other_status'"""
+    # Get damage_class - handle None, empty string, or missing
+    damage_class_raw = move.damage_class
+    if damage_class_raw:
+        damage_class = str(damage_class_raw).lower().strip()
+    else:
+        damage_class = ''
+
+    # Get power - handle None, 0, or missing
+    power_raw = move.power
+    if power_raw is not None:
+        try:
+            power = int(power_raw)
+        except (ValueError, TypeError):
+            power = 0
+    else:
+        power = 0
+
+    # Attacking moves: physical/special with power > 0
+    if damage_class in _ATTACK_CLASSES and power > 0:
+        return 'attacking'
+    # If damage_class is missing/empty but has power, treat as attack
+    if (not damage_class or damage_class == 'none') and power > 0:
+        return 'attacking'
+
+    # Everything else is a status move - separate into buffs and debuffs
+    return _status_category(move.name)
+
+
+@lru_cache(maxsize=None)
+def _status_category(move_name: str) -> str:
+    """Sort a status move into 'buffs', 'debuffs' or 'other_status' by name (cached - names repeat across Pokemon)"""
+    move_name = move_name.lower()
+    if _BUFF_RE.search(move_name):
+        return 'buffs'
+    if _DEBUFF_RE.search(move_name):
+        return 'debuffs'
+    return 'other_status'
+
+
+def _preprocess_pokemon(pokemon: Dict):
+    """
+    Convert a Pokemon's moves to Move records and sort them into
+    attacking/buff/debuff/other pools once at load time.
+    Every pool is ordered by learn_level and stored as (levels, moves) so
+    get_pokemon_moves can bisect out the level-eligible prefix.
+    """
+    # Only ~20 distinct type / damage class strings - share one copy of each
+    if 'types' in pokemon:
+        pokemon['types'] = [sys.intern(t) for t in pokemon['types']]
+
+    moves = sorted((
+        Move(
+            name=m.get('name', ''),
+            power=m.get('power') or 0,
+            accuracy=m.get('accuracy') or 100,
+            type=sys.intern(m.get('type') or 'normal'),
+            damage_class=sys.intern(m.get('damage_class') or 'physical'),
+            learn_level=m.get('learn_level', 0),
+            display_name=m.get('name', '').replace('-', ' ').title()
+        )
+        for m in pokemon.get('moves', [])
+    ), key=lambda m: m.learn_level)
+    pokemon['moves'] = moves
+    pools = {'attacking': [], 'buffs': [], 'debuffs': [], 'other_status': []}
+    for move in moves:
+        pools[_categorize_move(move)].append(move)
+
+    pokemon['_learn_levels'] = tuple(m.learn_level for m in moves)
+    pokemon['_move_pools'] = {
+        name: (tuple(m.learn_level for m in pool), tuple(pool))
+        for name, pool in pools.items()
+    }
+
+
+@lru_cache(maxsize=2048)
+def _categorize_moves(pokemon_id: int, max_level: int) -> Tuple[tuple, tuple, tuple]:
+    """
+    Get a Pokemon's (attacking, status, all) moves usable at max_level.
+    Status moves are buffs, then debuffs, then other status moves; all is attacking + status.
+    """
+    pokemon = get_pokemon(pokemon_id)
+    pools = pokemon['_move_pools']
+    learn_levels = pokemon['_learn_levels']
+    status_pools = (pools['buffs'], pools['debuffs'], pools['other_status'])
+
+    # Filter moves by level (but be VERY lenient - prioritize having moves over level restrictions)
+    # Strategy: Only apply level filtering if it leaves us with a good selection
+    # Otherwise, ignore level restrictions to ensure variety
+    # For very low levels (1-5), be extra lenient - most Pokemon learn moves later
+    # Skip it too when every move is already learned (e.g. the default max_level=100)
+    if learn_levels and 5 < max_level < learn_levels[-1]:
+        eligible = bisect_right(learn_levels, max_level)
+
+        # Use level-filtered moves only if:
+        # 1. We have at least 6 moves after filtering, OR
+        # 2. We have at least 60% of original moves after filtering
+        if eligible >= 6 or eligible >= len(learn_levels) * 0.6:
+            levels, moves = pools['attacking']
+            attacking = moves[:bisect_right(levels, max_level)]
+            status = tuple(chain.from_iterable(
+                moves[:bisect_right(levels, max_level)] for levels, moves in status_pools
+            ))
+            return attacking, status, attacking + status
+
+    attacking = pools['attacking'][1]
+    status = tuple(chain.from_iterable(moves for _, moves in status_pools))
+    return attacking, status, attacking + status
+
+
+@lru_cache(maxsize=None)
+def _filler_move(move_type: str) -> Move:
+    """Tackle of the given type, used to pad movesets that come up short"""
+    return Move(
+        name='tackle',
+        power=40,
+        accuracy=100,
+        type=move_type,
+        damage_class='physical',
+        learn_level=1,
+        display_name='Tackle'
+    )
 
 
 def get_pokemon_moves(pokemon_id: int, num_moves: int = 4, max_level: int = 100) -> List[Dict]:
@@ -66,14 +368,8 @@ def get_pokemon_moves(pokemon_id: int, num_moves: int = 4, max_level: int = 100)
     pokemon = get_pokemon(pokemon_id)
     if not pokemon:
         # Pokemon data not found - this shouldn't happen if pokemon_data.json exists
-        # But if it does, use type-appropriate defaults
-        pokemon_types = ['normal']  # Default type
-        return [
-            {'name': 'Tackle', 'power': 40, 'accuracy': 100, 'type': pokemon_types[0], 'damage_class': 'physical'},
-            {'name': 'Scratch', 'power': 40, 'accuracy': 100, 'type': pokemon_types[0], 'damage_class': 'physical'},
-            {'name': 'Growl', 'power': 0, 'accuracy': 100, 'type': pokemon_types[0], 'damage_class': 'status'},
-            {'name': 'Tail Whip', 'power': 0, 'accuracy': 100, 'type': pokemon_types[0], 'damage_class': 'status'}
-        ]
+        # But if it does, use the default moveset (copied - battles keep their own move dicts)
+        return [dict(m) for m in _DEFAULT_MOVESET]
 
     all_moves = pokemon.get('moves', [])
     
@@ -84,238 +380,92 @@ def get_pokemon_moves(pokemon_id: int, num_moves: int = 4, max_level: int = 100)
         primary_type = pokemon_types[0] if pokemon_types else 'normal'
         
         # Use type-appropriate default moves instead of always normal
-        type_defaults = {
-            'fire': [{'name': 'Ember', 'power': 40, 'accuracy': 100, 'type': 'fire', 'damage_class': 'special'}],
-            'water': [{'name': 'Water Gun', 'power': 40, 'accuracy': 100, 'type': 'water', 'damage_class': 'special'}],
-            'grass': [{'name': 'Vine Whip', 'power': 45, 'accuracy': 100, 'type': 'grass', 'damage_class': 'physical'}],
-            'electric': [{'name': 'Thunder Shock', 'power': 40, 'accuracy': 100, 'type': 'electric', 'damage_class': 'special'}],
-            'psychic': [{'name': 'Confusion', 'power': 50, 'accuracy': 100, 'type': 'psychic', 'damage_class': 'special'}],
-        }
-        
-        defaults = type_defaults.get(primary_type, [
-            {'name': 'Tackle', 'power': 40, 'accuracy': 100, 'type': primary_type, 'damage_class': 'physical'}
-        ])
-        
-        # Fill remaining slots
-        while len(defaults) < num_moves:
-            defaults.append({
-                'name': 'Scratch',
-                'power': 40,
-                'accuracy': 100,
-                'type': primary_type,
-                'damage_class': 'physical'
-            })
-        
-        return [{
-            'name': m['name'].replace('-', ' ').title(),
-            'power': m.get('power', 40),
-            'accuracy': m.get('accuracy', 100),
-            'type': m.get('type', primary_type),
-            'damage_class': m.get('damage_class', 'physical')
-        } for m in defaults[:num_moves]]
+        first_move = _TYPE_DEFAULT_MOVES.get(primary_type)
+        if first_move is None:
+            first_move = {'name': 'Tackle', 'power': 40, 'accuracy': 100, 'type': primary_type, 'damage_class': 'physical'}
 
-    # Filter moves by level (but be VERY lenient - prioritize having moves over level restrictions)
-    # Strategy: Only apply level filtering if it leaves us with a good selection
-    # Otherwise, ignore level restrictions to ensure variety
-    
-    # For very low levels (1-5), be extra lenient - most Pokemon learn moves later
-    if max_level <= 5:
-        # At low levels, ignore level restrictions entirely to ensure variety
-        available_moves = all_moves
+        # Fill remaining slots
+        defaults = [dict(first_move)]
+        defaults.extend(
+            {'name': 'Scratch', 'power': 40, 'accuracy': 100, 'type': primary_type, 'damage_class': 'physical'}
+            for _ in range(num_moves - 1)
+        )
+        return defaults[:num_moves]
+
+    attacking_moves, status_pool, all_moves_pool = _categorize_moves(pokemon_id, max_level)
+    sample, choice = random.sample, random.choice  # Local aliases for the selection below
+
+    if len(all_moves_pool) <= num_moves:
+        # Every eligible move fits - no strategy roll or sampling needed
+        selected_moves = list(all_moves_pool)
     else:
-        # Try level filtering first
-        level_filtered = [m for m in all_moves if m.get('learn_level', 0) <= max_level]
-        
-        # Use level-filtered moves only if:
-        # 1. We have at least 6 moves after filtering, OR
-        # 2. We have at least 60% of original moves after filtering
-        if len(level_filtered) >= 6 or (len(all_moves) > 0 and len(level_filtered) >= len(all_moves) * 0.6):
-            available_moves = level_filtered
-        else:
-            # Level filtering is too restrictive - use all moves regardless of level
-            # This ensures Pokemon always have varied movesets
-            available_moves = all_moves
-    
-    # If still no moves after all filtering, something is wrong with the data
-    # But try to use type-appropriate defaults as last resort
-    if not available_moves:
-        pokemon_types = pokemon.get('types', ['normal'])
-        primary_type = pokemon_types[0] if pokemon_types else 'normal'
-        pokemon_name = pokemon.get('name', 'Unknown')
-        
-        # Log warning (only in debug mode - you can enable this if needed)
-        # print(f"[WARNING] No moves found for {pokemon_name} (ID: {pokemon_id}), using defaults")
-        
-        return [
-            {'name': 'Tackle', 'power': 40, 'accuracy': 100, 'type': primary_type, 'damage_class': 'physical'},
-            {'name': 'Scratch', 'power': 40, 'accuracy': 100, 'type': primary_type, 'damage_class': 'physical'},
-            {'name': 'Growl', 'power': 0, 'accuracy': 100, 'type': primary_type, 'damage_class': 'status'},
-            {'name': 'Tail Whip', 'power': 0, 'accuracy': 100, 'type': primary_type, 'damage_class': 'status'}
-        ]
-
-    # Categorize moves - be more lenient with categorization
-    attacking_moves = []
-    status_moves = []
-    
-    for m in available_moves:
-        # Get damage_class - handle None, empty string, or missing
-        damage_class_raw = m.get('damage_class')
-        if damage_class_raw:
-            damage_class = str(damage_class_raw).lower().strip()
-        else:
-            damage_class = ''
-        
-        # Get power - handle None, 0, or missing
-        power_raw = m.get('power')
-        if power_raw is not None:
-            try:
-                power = int(power_raw)
-            except (ValueError, TypeError):
-                power = 0
-        else:
-            power = 0
-        
-        # Attacking moves: physical/special with power > 0
-        if damage_class in ['physical', 'special'] and power > 0:
-            attacking_moves.append(m)
-        # Status moves: explicitly status OR power is 0
-        elif damage_class == 'status' or power == 0:
-            status_moves.append(m)
-        # If damage_class is missing/empty but has power, treat as attack
-        elif (not damage_class or damage_class == 'none') and power > 0:
-            attacking_moves.append(m)
-        # Otherwise, default to status
-        else:
-            status_moves.append(m)
-    
-    # Safety check: if we have moves but categorization failed, try harder
-    if available_moves and not attacking_moves and not status_moves:
-        # Something went wrong - just use all moves as-is
-        attacking_moves = [m for m in available_moves if m.get('power', 0) > 0]
-        status_moves = [m for m in available_moves if m not in attacking_moves]
-
-    # Separate status moves into buffs and debuffs
-    debuff_keywords = ['lower', 'reduce', 'poison', 'paralyze', 'burn', 'freeze', 'confuse', 'sleep', 'stun', 'disable']
-    buff_keywords = ['raise', 'increase', 'sharpen', 'harden', 'defense', 'agility', 'swords', 'dance', 'bulk', 'calm', 'mind']
-
-    buffs = []
-    debuffs = []
-    other_status = []  # Status moves that don't clearly fit buff/debuff
-    
-    for move in status_moves:
-        move_name = move.get('name', '').lower()
-        if any(keyword in move_name for keyword in buff_keywords):
-            buffs.append(move)
-        elif any(keyword in move_name for keyword in debuff_keywords):
-            debuffs.append(move)
-        else:
-            other_status.append(move)
-
-    # Ensure we have at least 1 attacking move
-    selected_moves = []
-    
-    # Randomly decide moveset composition (weighted towards having attacks)
-    # Strategy types:
-    # 1. All-out attacker (3-4 attacks)
-    # 2. Balanced (2-3 attacks, 1-2 status)
-    # 3. Status specialist (1-2 attacks, 2-3 status)
-    # 4. Mixed (varied)
-    
-    strategy_roll = random.random()
-    
-    if strategy_roll < 0.35:  # 35% chance - All-out attacker
-        # 3-4 attacking moves
-        num_attacks = random.choice([3, 4]) if len(attacking_moves) >= 3 else min(len(attacking_moves), num_moves)
-        if num_attacks > 0:
-            selected_moves.extend(random.sample(attacking_moves, min(num_attacks, len(attacking_moves))))
-        # Fill remaining slots with random moves
-        remaining = num_moves - len(selected_moves)
-        if remaining > 0:
-            all_other = buffs + debuffs + other_status
-            if all_other:
-                selected_moves.extend(random.sample(all_other, min(remaining, len(all_other))))
-    
-    elif strategy_roll < 0.70:  # 35% chance - Balanced
-        # 2-3 attacks, 1-2 status
-        num_attacks = random.choice([2, 3]) if len(attacking_moves) >= 2 else min(len(attacking_moves), num_moves - 1)
-        if num_attacks > 0:
-            selected_moves.extend(random.sample(attacking_moves, min(num_attacks, len(attacking_moves))))
-        
-        remaining = num_moves - len(selected_moves)
-        if remaining > 0:
-            status_pool = buffs + debuffs + other_status
-            if status_pool:
-                num_status = min(remaining, len(status_pool))
-                selected_moves.extend(random.sample(status_pool, num_status))
-    
-    elif strategy_roll < 0.90:  # 20% chance - Status specialist
-        # 1-2 attacks, 2-3 status
-        num_attacks = random.choice([1, 2]) if len(attacking_moves) >= 1 else 0
-        if num_attacks > 0:
-            selected_moves.extend(random.sample(attacking_moves, min(num_attacks, len(attacking_moves))))
-        
-        remaining = num_moves - len(selected_moves)
-        if remaining > 0:
-            status_pool = buffs + debuffs + other_status
-            if status_pool:
-                num_status = min(remaining, len(status_pool))
-                selected_moves.extend(random.sample(status_pool, num_status))
-    
-    else:  # 10% chance - Completely random
-        # Just pick randomly from all moves
-        all_moves_pool = attacking_moves + buffs + debuffs + other_status
-        if all_moves_pool:
-            # Ensure at least 1 attack
-            if attacking_moves and not any(m.get('damage_class') in ['physical', 'special'] for m in selected_moves):
-                selected_moves.append(random.choice(attacking_moves))
-            # Fill rest randomly
+        selected_moves = []
+
+        # Randomly decide moveset composition (weighted towards having attacks)
+        strategy = random.choices(_MOVESET_STRATEGIES, cum_weights=_MOVESET_STRATEGY_CUM_WEIGHTS)[0]
+
+        if strategy is not None:
+            attack_counts, min_attacks, reserved_status = strategy
+            if len(attacking_moves) >= min_attacks:
+                num_attacks = choice(attack_counts)
+            else:
+                # Not enough attacks for this strategy - take what there is
+                num_attacks = min(len(attacking_moves), num_moves - reserved_status)
+            if num_attacks > 0:
+                selected_moves.extend(sample(attacking_moves, min(num_attacks, len(attacking_moves))))
+
+            # Fill remaining slots with status moves
             remaining = num_moves - len(selected_moves)
             if remaining > 0:
-                pool = [m for m in all_moves_pool if m not in selected_moves]
-                if pool:
-                    selected_moves.extend(random.sample(pool, min(remaining, len(pool))))
+                if status_pool:
+                    selected_moves.extend(sample(status_pool, min(remaining, len(status_pool))))
+
+        else:  # Completely random
+            # Just pick randomly from all moves (attacking moves come first in all_moves_pool)
+            if all_moves_pool:
+                taken = None
+                # Ensure at least 1 attack (nothing has been selected yet in this branch)
+                if attacking_moves:
+                    taken = random.randrange(len(attacking_moves))
+                    selected_moves.append(all_moves_pool[taken])
+                # Fill rest randomly - sample indices that skip over the attack already taken
+                remaining = num_moves - len(selected_moves)
+                available = len(all_moves_pool) - (taken is not None)
+                if remaining > 0 and available > 0:
+                    for index in sample(range(available), min(remaining, available)):
+                        if taken is not None and index >= taken:
+                            index += 1
+                        selected_moves.append(all_moves_pool[index])
 
     # Ensure we have at least 1 attacking move (critical for battle viability)
-    has_attack = any(m.get('damage_class') in ['physical', 'special'] and (m.get('power') or 0) > 0 for m in selected_moves)
+    has_attack = any(m.damage_class in _ATTACK_CLASSES and m.power > 0 for m in selected_moves)
     if not has_attack and attacking_moves:
         # Replace a random move with an attack
         if selected_moves:
-            selected_moves[random.randint(0, len(selected_moves) - 1)] = random.choice(attacking_moves)
+            selected_moves[random.randint(0, len(selected_moves) - 1)] = choice(attacking_moves)
         else:
-            selected_moves.append(random.choice(attacking_moves))
+            selected_moves.append(choice(attacking_moves))
 
     # If we still don't have enough moves, fill with defaults
-    while len(selected_moves) < num_moves:
-        if attacking_moves and not any(m.get('damage_class') in ['physical', 'special'] for m in selected_moves):
-            selected_moves.append(random.choice(attacking_moves))
-        else:
-            # Add a default move
-            default_move = {
-                'name': 'tackle',
-                'power': 40,
-                'accuracy': 100,
-                'type': pokemon.get('types', ['normal'])[0],
-                'damage_class': 'physical'
-            }
-            selected_moves.append(default_move)
+    # (any attacking move was already guaranteed above, so only defaults are left)
+    deficit = num_moves - len(selected_moves)
+    if deficit > 0:
+        selected_moves.extend([_filler_move(pokemon.get('types', ['normal'])[0])] * deficit)
 
     # Shuffle the moveset for extra randomness
     random.shuffle(selected_moves)
 
     # Format moves for battle system
-    formatted_moves = []
-    for move in selected_moves[:num_moves]:
-        formatted_moves.append({
-            'name': move['name'].replace('-', ' ').title(),
-            'power': move.get('power') or 0,
-            'accuracy': move.get('accuracy') or 100,
-            'type': move.get('type', 'normal'),
-            'damage_class': move.get('damage_class', 'physical')
-        })
-
-    return formatted_moves
+    return [{
+        'name': move.display_name,
+        'power': move.power,
+        'accuracy': move.accuracy,
+        'type': move.type,
+        'damage_class': move.damage_class
+    } for move in selected_moves[:num_moves]]
 
 
+@lru_cache(maxsize=2048)
 def get_pokemon_name(pokemon_id: int) -> str:
     """Get Pokemon name"""
     pokemon = get_pokemon(pokemon_id)
@@ -326,46 +476,19 @@ def get_pokemon_name(pokemon_id: int) -> str:
 
 def get_pokemon_generation(pokemon_id: int) -> int:
     """Get Pokemon generation number based on ID"""
-    if 1 <= pokemon_id <= 151:
-        return 1
-    elif 152 <= pokemon_id <= 251:
-        return 2
-    elif 252 <= pokemon_id <= 386:
-        return 3
-    elif 387 <= pokemon_id <= 493:
-        return 4
-    elif 494 <= pokemon_id <= 649:
-        return 5
-    elif 650 <= pokemon_id <= 721:
-        return 6
-    elif 722 <= pokemon_id <= 809:
-        return 7
-    elif 810 <= pokemon_id <= 905:
-        return 8
-    else:
+    if pokemon_id < 1:
         return 9
+    return bisect_left(_GENERATION_LAST_IDS, pokemon_id) + 1
 
 
 def get_generation_range(generation: int) -> tuple:
     """Get the ID range for a specific generation"""
-    ranges = {
-        1: (1, 151),
-        2: (152, 251),
-        3: (252, 386),
-        4: (387, 493),
-        5: (494, 649),
-        6: (650, 721),
-        7: (722, 809),
-        8: (810, 905),
-        9: (906, 1025)
-    }
-    return ranges.get(generation, (1, 151))
+    if 1 <= generation <= len(_GENERATION_RANGES):
+        return _GENERATION_RANGES[generation - 1]
+    return _GENERATION_RANGES[0]
 
 
 def has_local_data() -> bool:
     """Check if local Pokemon data is loaded"""
-    return len(POKEMON_DATA) > 0
-
-
-# Load data when module is imported
-load_pokemon_data()
+    _ensure_loaded()
+    return len(POKEMON_DATA) > 0 or len(_entry_spans) > 0
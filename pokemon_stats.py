@@ -1,3 +1,6 @@
+from functools import lru_cache
+from types import MappingProxyType
+
 # Gen 1 Pokemon Base Stats (ID: {HP, Attack, Defense, Speed})
 # Simplified for basic battle system
 
@@ -91,34 +94,71 @@ TYPE_IMMUNITIES = {
 }
 
 
+def _build_type_chart() -> dict:
+    """Flatten the type tables into {(attacker_type, defender_type): multiplier} (1x pairs omitted)"""
+    chart = {}
+    # Later tables win: immunity beats advantage, advantage beats resistance
+    for table, multiplier in ((TYPE_RESISTANCES, 0.5), (TYPE_ADVANTAGES, 2.0), (TYPE_IMMUNITIES, 0.0)):
+        for atk_type, def_types in table.items():
+            for def_type in def_types:
+                chart[(atk_type, def_type)] = multiplier
+    return chart
+
+
+TYPE_CHART = _build_type_chart()
+
+
+# Read-only views handed out by get_pokemon_stats (callers only read base stats)
+_BASE_STATS_VIEWS = {pokemon_id: MappingProxyType(stats) for pokemon_id, stats in POKEMON_BASE_STATS.items()}
+_DEFAULT_STATS_VIEW = MappingProxyType(DEFAULT_STATS)
+
+
 def get_pokemon_stats(pokemon_id: int) -> dict:
-    """Get base stats for a Pokemon"""
-    return POKEMON_BASE_STATS.get(pokemon_id, DEFAULT_STATS).copy()
+    """Get base stats for a Pokemon (read-only; use dict(...) for a mutable copy)"""
+    return _BASE_STATS_VIEWS.get(pokemon_id, _DEFAULT_STATS_VIEW)
 
 
 def calculate_battle_stats(base_stats: dict, level: int) -> dict:
     """Calculate battle stats based on base stats and level"""
+    get = base_stats.get
+    attack = get('attack', 50)
+    defense = get('defense', 50)
+    offense_bonus = int(level * 1.5)  # Shared by attack and special-attack
     return {
-        'hp': base_stats.get('hp', 50) + (level * 2),
-        'attack': base_stats.get('attack', 50) + int(level * 1.5),
-        'defense': base_stats.get('defense', 50) + level,
-        'speed': base_stats.get('speed', 50),
-        'special-attack': base_stats.get('special-attack', base_stats.get('attack', 50)) + int(level * 1.5),
-        'special-defense': base_stats.get('special-defense', base_stats.get('defense', 50)) + level
+        'hp': get('hp', 50) + (level * 2),
+        'attack': attack + offense_bonus,
+        'defense': defense + level,
+        'speed': get('speed', 50),
+        'special-attack': get('special-attack', attack) + offense_bonus,
+        'special-defense': get('special-defense', defense) + level
     }
 
 
+def _hp_bars(color: str) -> tuple:
+    """Every bar of the given colour, indexed by filled segments (0-10)"""
+    return tuple(f"{color * filled}{'⬜' * (10 - filled)}" for filled in range(11))
+
+
+_GREEN_HP_BARS = _hp_bars('🟩')
+_YELLOW_HP_BARS = _hp_bars('🟨')
+_RED_HP_BARS = _hp_bars('🟥')
+
+
 def create_hp_bar(hp_percent: float) -> str:
     """Create a visual HP bar"""
     filled = int(hp_percent / 10)
-    empty = 10 - filled
 
     if hp_percent > 50:
-        return f"{'🟩' * filled}{'⬜' * empty}"
+        color, bars = '🟩', _GREEN_HP_BARS
     elif hp_percent > 25:
-        return f"{'🟨' * filled}{'⬜' * empty}"
+        color, bars = '🟨', _YELLOW_HP_BARS
     else:
-        return f"{'🟥' * filled}{'⬜' * empty}"
+        color, bars = '🟥', _RED_HP_BARS
+
+    if 0 <= filled <= 10:
+        return bars[filled]
+    # HP outside 0-100% - build the (over/underfull) bar directly
+    return f"{color * filled}{'⬜' * (10 - filled)}"
 
 
 # Stat stage multipliers (from -6 to +6)
@@ -128,11 +168,17 @@ STAT_STAGE_MULTIPLIERS = {
     1: 3/2, 2: 4/2, 3: 5/2, 4: 6/2, 5: 7/2, 6: 8/2
 }
 
+# The same multipliers indexed by stage + 6 (-6..+6 -> 0..12), for get_stat_stage_multiplier
+_STAGE_MULTIPLIERS = tuple(STAT_STAGE_MULTIPLIERS[stage] for stage in range(-6, 7))
+
 
 def get_stat_stage_multiplier(stage: int) -> float:
     """Get multiplier for a stat stage"""
-    stage = max(-6, min(6, stage))  # Clamp between -6 and +6
-    return STAT_STAGE_MULTIPLIERS[stage]
+    if stage < -6:  # Clamp between -6 and +6
+        stage = -6
+    elif stage > 6:
+        stage = 6
+    return _STAGE_MULTIPLIERS[stage + 6]
 
 
 def apply_stat_stages(base_stat: int, stage: int) -> int:
@@ -229,24 +275,25 @@ def get_move_stat_changes(move_name: str) -> dict:
 
 def get_type_effectiveness(attacker_types: list, defender_types: list) -> float:
     """Calculate type effectiveness multiplier"""
+    return _type_effectiveness(tuple(attacker_types), tuple(defender_types))
+
+
+@lru_cache(maxsize=4096)
+def _type_effectiveness(attacker_types: tuple, defender_types: tuple) -> float:
+    """Cached type effectiveness for hashable type tuples (only a few thousand combinations exist)"""
     multiplier = 1.0
+    defender_types = [def_type.lower() for def_type in defender_types]
 
     for atk_type in attacker_types:
         atk_type = atk_type.lower()
 
         for def_type in defender_types:
-            def_type = def_type.lower()
+            effectiveness = TYPE_CHART.get((atk_type, def_type), 1.0)
 
-            # Check immunity
-            if def_type in TYPE_IMMUNITIES.get(atk_type, []):
+            # Immunity cancels everything else
+            if effectiveness == 0.0:
                 return 0.0
 
-            # Check advantage
-            if def_type in TYPE_ADVANTAGES.get(atk_type, []):
-                multiplier *= 2.0
-
-            # Check resistance
-            elif def_type in TYPE_RESISTANCES.get(atk_type, []):
-                multiplier *= 0.5
+            multiplier *= effectiveness
 
     return multiplier
@@ -1,7 +1,8 @@
 # Daily Quest System
 import random
+from collections import namedtuple
 from datetime import date
-from typing import Dict, List, Optional
+from typing import List, Optional
 
 # Quest type definitions with targets and rewards
 QUEST_TYPES = {
@@ -332,24 +333,26 @@ QUEST_TYPES = {
 }
 
 
-def generate_daily_quests() -> List[Dict]:
-    """Generate 3 random daily quests"""
-    all_quests = []
+# A single rolled quest - immutable, so the pool below can be handed out directly
+Quest = namedtuple('Quest', 'type target reward description')
+
+# Every quest variant flattened once - QUEST_TYPES never changes at runtime
+_FLAT_QUESTS = tuple(
+    Quest(quest_type, variant['target'], variant['reward'], variant['description'])
+    for quest_type, data in QUEST_TYPES.items()
+    for variant in data['variants']
+)
+
+# Quests keyed the way daily_quests rows store them (first variant wins on duplicates)
+_QUESTS_BY_KEY = {(quest.type, quest.target, quest.reward): quest for quest in reversed(_FLAT_QUESTS)}
 
-    # Flatten all quest variants
-    for quest_type, data in QUEST_TYPES.items():
-        for variant in data['variants']:
-            all_quests.append({
-                'type': quest_type,
-                'target': variant['target'],
-                'reward': variant['reward'],
-                'description': variant['description']
-            })
 
-    # Select 3 random quests (make sure we have enough variety)
-    if len(all_quests) >= 3:
-        selected = random.sample(all_quests, 3)
-    else:
-        selected = all_quests + [random.choice(all_quests) for _ in range(3 - len(all_quests))]
+def generate_daily_quests() -> List[Quest]:
+    """Generate 3 random daily quests"""
+    # The quest table has far more than 3 variants, so sampling never runs short
+    return random.sample(_FLAT_QUESTS, 3)
+
 
-    return selected
+def get_quest(quest_type: str, target: int, reward: int) -> Optional[Quest]:
+    """Find the quest variant a stored daily quest was rolled from"""
+    return _QUESTS_BY_KEY.get((quest_type, target, reward))
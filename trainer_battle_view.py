@@ -9,16 +9,27 @@ import pokemon_data_loader as poke_data
 import pokemon_stats as pkmn
 import database as db
 
+_random = random.random  # Bound once - damage rolls happen several times per turn
+
 
 class TrainerBattleView(View):
     """View for trainer battles - simpler than gym battles, 1 user Pokemon vs trainer team"""
 
-    def __init__(self, user: discord.Member, guild_id: int, trainer: dict, trainer_team: list, wild_pokemon: dict, user_pokemon: list, time_taken: float, is_shiny: bool = False):
+    def __init__(self, user: discord.Member, guild_id: int, trainer: dict, trainer_team: list, wild_pokemon: dict, user_pokemon: list, time_taken: float, is_shiny: bool = False, active_battles: dict = None):
         super().__init__(timeout=600)
+        if active_battles is None:
+            import bot  # Imported here to avoid a circular import at module load
+            active_battles = bot.active_trainer_battles
+        self._active_battles = active_battles  # bot's {user_id: battle_data} registry, cleared when the battle ends
         self.user = user
         self.guild_id = guild_id
         self.trainer = trainer
         self.trainer_team = trainer_team  # List of {'pokemon_id': int, 'level': int}
+        # The team never changes, so its embed text is built once rather than on every page flip
+        self._team_text = "\n".join([
+            f"• **{poke_data.get_pokemon_name(p['pokemon_id'])}** (Lv.{p['level']})"
+            for p in trainer_team
+        ])
         self.wild_pokemon = wild_pokemon  # The Pokemon being fought over
         self.user_pokemon = user_pokemon
         self.time_taken = time_taken
@@ -70,6 +81,8 @@ class TrainerBattleView(View):
 
         self.unique_pokemon = list(seen_species.values())
         self.total_pages = (len(self.unique_pokemon) + self.pokemon_per_page - 1) // self.pokemon_per_page
+        self._page_options = {}  # Page number -> SelectOptions, built the first time the page is shown
+        self._pokemon_by_id = {pokemon['id']: pokemon for pokemon in self.unique_pokemon}  # Dropdown values are these IDs
 
         # Create initial selection UI
         self.update_pokemon_selection()
@@ -78,32 +91,19 @@ class TrainerBattleView(View):
         """Update Pokemon dropdown for current page"""
         self.clear_items()
 
-        # Calculate pagination
-        start_idx = self.current_page * self.pokemon_per_page
-        end_idx = min(start_idx + self.pokemon_per_page, len(self.unique_pokemon))
-        page_pokemon = self.unique_pokemon[start_idx:end_idx]
+        # Options for a page never change, so flipping back reuses them
+        options = self._page_options.get(self.current_page)
+        if options is None:
+            options = self._page_options[self.current_page] = self._build_page_options(self.current_page)
 
         # Create dropdown
         self.pokemon_select = Select(
             placeholder=f"Choose 1 Pokemon to battle {self.trainer['name']}...",
             min_values=1,
-            max_values=1
+            max_values=1,
+            options=list(options)
         )
 
-        for pokemon in page_pokemon:
-            level = pokemon.get('level', 1)
-            is_shiny = pokemon.get('is_shiny', False)
-            shiny_indicator = "✨ " if is_shiny else ""
-            types = poke_data.get_pokemon_types(pokemon['pokemon_id'])
-            types_str = '/'.join([t.title() for t in types]) if types else 'Unknown'
-
-            self.pokemon_select.add_option(
-                label=f"{shiny_indicator}{pokemon['pokemon_name']} (Lv.{level})",
-                value=str(pokemon['id']),
-                description=f"#{pokemon['pokemon_id']} - {types_str}",
-                emoji="✨" if is_shiny else "⚔️"
-            )
-
         self.pokemon_select.callback = self.pokemon_selected
         self.add_item(self.pokemon_select)
 
@@ -127,6 +127,27 @@ class TrainerBattleView(View):
             next_button.callback = self.next_page
             self.add_item(next_button)
 
+    def _build_page_options(self, page: int) -> list:
+        """Build the dropdown options for one page of the user's Pokemon"""
+        start_idx = page * self.pokemon_per_page
+        end_idx = min(start_idx + self.pokemon_per_page, len(self.unique_pokemon))
+
+        options = []
+        for pokemon in self.unique_pokemon[start_idx:end_idx]:
+            level = pokemon.get('level', 1)
+            is_shiny = pokemon.get('is_shiny', False)
+            shiny_indicator = "✨ " if is_shiny else ""
+            types = poke_data.get_pokemon_types(pokemon['pokemon_id'])
+            types_str = '/'.join([t.title() for t in types]) if types else 'Unknown'
+
+            options.append(discord.SelectOption(
+                label=f"{shiny_indicator}{pokemon['pokemon_name']} (Lv.{level})",
+                value=str(pokemon['id']),
+                description=f"#{pokemon['pokemon_id']} - {types_str}",
+                emoji="✨" if is_shiny else "⚔️"
+            ))
+        return options
+
     async def previous_page(self, interaction: discord.Interaction):
         """Go to previous page of Pokemon"""
         if interaction.user.id != self.user.id:
@@ -172,13 +193,9 @@ class TrainerBattleView(View):
         )
 
         # Show trainer's team
-        team_text = "\n".join([
-            f"• **{poke_data.get_pokemon_name(p['pokemon_id'])}** (Lv.{p['level']})"
-            for p in self.trainer_team
-        ])
         embed.add_field(
             name=f"{self.trainer['sprite']} {self.trainer['class']}'s Team",
-            value=team_text,
+            value=self._team_text,
             inline=False
         )
 
@@ -201,7 +218,7 @@ class TrainerBattleView(View):
 
         # Get selected Pokemon
         selected_id = int(self.pokemon_select.values[0])
-        selected_pokemon = next((p for p in self.user_pokemon if p['id'] == selected_id), None)
+        selected_pokemon = self._pokemon_by_id.get(selected_id)
 
         if not selected_pokemon:
             await interaction.followup.send("❌ Pokemon not found!", ephemeral=True)
@@ -302,7 +319,7 @@ class TrainerBattleView(View):
                 custom_id=f"move_{i}",
                 row=i // 2
             )
-            move_button.callback = self.create_move_callback(i)
+            move_button.callback = self.move_selected
             self.add_item(move_button)
 
         # Add flee button in last row
@@ -315,17 +332,15 @@ class TrainerBattleView(View):
         flee_button.callback = self.flee_battle
         self.add_item(flee_button)
 
-    def create_move_callback(self, move_index: int):
-        """Create callback for move button"""
-        async def callback(interaction: discord.Interaction):
-            if interaction.user.id != self.user.id:
-                await interaction.response.send_message("❌ This isn't your battle!", ephemeral=True)
-                return
-
-            await interaction.response.defer()
-            await self.execute_turn(move_index, interaction)
+    async def move_selected(self, interaction: discord.Interaction):
+        """Handle a move button press (custom_id is "move_<index>")"""
+        if interaction.user.id != self.user.id:
+            await interaction.response.send_message("❌ This isn't your battle!", ephemeral=True)
+            return
 
-        return callback
+        await interaction.response.defer()
+        move_index = int(interaction.data['custom_id'][len('move_'):])
+        await self.execute_turn(move_index, interaction)
 
     async def execute_turn(self, user_move_index: int, interaction: discord.Interaction):
         """Execute a battle turn"""
@@ -356,20 +371,20 @@ class TrainerBattleView(View):
             # Check if user can move
             can_move = await self.check_status_can_move(True)
             if can_move:
-                await self.user_attacks(user_move)
+                self.user_attacks(user_move)
             if self.trainer_current_hp > 0:  # Trainer still alive
                 can_move = await self.check_status_can_move(False)
                 if can_move:
-                    await self.trainer_attacks()
+                    self.trainer_attacks()
         else:
             # Trainer goes first
             can_move = await self.check_status_can_move(False)
             if can_move:
-                await self.trainer_attacks()
+                self.trainer_attacks()
             if self.user_current_hp > 0:  # User still alive
                 can_move = await self.check_status_can_move(True)
                 if can_move:
-                    await self.user_attacks(user_move)
+                    self.user_attacks(user_move)
 
         # Apply end-of-turn status damage
         await self.apply_status_damage()
@@ -390,9 +405,7 @@ class TrainerBattleView(View):
                 await self.handle_victory(interaction)
                 return
 
-        # Update UI
-        self.clear_items()
-        await self.create_battle_buttons()
+        # Update UI (the move buttons built in pokemon_selected never change mid-battle)
         embed = self.create_battle_embed()
 
         # Use the interaction's message to edit (avoids interaction timeout issues)
@@ -528,7 +541,7 @@ class TrainerBattleView(View):
             emoji = emoji_map.get(new_status, '✨')
             self.battle_log.append(f"{emoji} **{target_name}** was {new_status}ed!")
 
-    async def user_attacks(self, move: dict):
+    def user_attacks(self, move: dict):
         """User's Pokemon attacks"""
         # Check if it's a status move
         if move['damage_class'] == 'status' or move.get('power', 0) == 0:
@@ -542,7 +555,7 @@ class TrainerBattleView(View):
             return
 
         # Calculate damage for attacking moves
-        damage, is_crit, hit = await self.calculate_damage(
+        damage, is_crit, hit = self.calculate_damage(
             move,
             self.user_choice,
             self.trainer_current_pokemon,
@@ -570,7 +583,7 @@ class TrainerBattleView(View):
         else:
             self.battle_log.append(f"**{self.user_choice['pokemon_name']}** used **{move['name']}**... but it missed!")
 
-    async def trainer_attacks(self):
+    def trainer_attacks(self):
         """Trainer's Pokemon attacks"""
         # Trainer picks random move
         move = random.choice(self.trainer_current_pokemon['moves'])
@@ -587,7 +600,7 @@ class TrainerBattleView(View):
             return
 
         # Calculate damage for attacking moves
-        damage, is_crit, hit = await self.calculate_damage(
+        damage, is_crit, hit = self.calculate_damage(
             move,
             self.trainer_current_pokemon,
             self.user_choice,
@@ -615,17 +628,18 @@ class TrainerBattleView(View):
         else:
             self.battle_log.append(f"**{self.trainer_current_pokemon['pokemon_name']}** used **{move['name']}**... but it missed!")
 
-    async def calculate_damage(self, move: dict, attacker: dict, defender: dict, attacker_stat_stages: dict, attacker_status: str, defender_stat_stages: dict) -> tuple:
+    def calculate_damage(self, move: dict, attacker: dict, defender: dict, attacker_stat_stages: dict, attacker_status: str, defender_stat_stages: dict) -> tuple:
         """Calculate damage from a move. Returns (damage, is_crit, hit_success)"""
         # Check accuracy
         accuracy = move.get('accuracy', 100)
         accuracy_stage = attacker_stat_stages.get('accuracy', 0)
         evasion_stage = defender_stat_stages.get('evasion', 0)
         net_accuracy_stage = accuracy_stage - evasion_stage
-        accuracy_multiplier = pkmn.get_stat_stage_multiplier(net_accuracy_stage)
+        accuracy_multiplier = pkmn.get_stat_stage_multiplier(net_accuracy_stage)  # Clamps to -6..+6
 
         final_accuracy = min(100, accuracy * accuracy_multiplier)
-        if random.randint(1, 100) > final_accuracy:
+        # Same 1-100 roll as randint(1, 100), without its range-checking overhead
+        if int(_random() * 100) + 1 > final_accuracy:
             return 0, False, False  # Miss!
 
         # Check if it's a status move
@@ -633,7 +647,7 @@ class TrainerBattleView(View):
             return 0, False, True  # Status move, no damage but it "hit"
 
         # Check critical hit
-        is_crit = random.random() < 0.0625  # 6.25% crit chance
+        is_crit = _random() < 0.0625  # 6.25% crit chance
 
         # Calculate base damage
         power = move.get('power', 50)
@@ -670,7 +684,7 @@ class TrainerBattleView(View):
             damage *= 1.5
 
         # Random factor (0.85 to 1.0)
-        damage *= random.uniform(0.85, 1.0)
+        damage *= 0.85 + 0.15 * _random()
 
         # Type effectiveness
         move_type = move.get('type', 'normal')
@@ -863,25 +877,13 @@ class TrainerBattleView(View):
 
     async def handle_victory(self, interaction: discord.Interaction):
         """Handle battle victory"""
-        # Award wild Pokemon
-        await db.add_catch(
-            user_id=self.user.id,
-            guild_id=self.guild_id,
-            pokemon_name=self.wild_pokemon['name'],
-            pokemon_id=self.wild_pokemon['id'],
-            pokemon_types=self.wild_pokemon['types'],
-            is_shiny=self.is_shiny
-        )
-
-        # Award money
-        await db.add_currency(self.user.id, self.guild_id, self.trainer['reward_money'])
-
-        # Award XP
+        # Award the wild Pokemon, money and XP in one transaction
         xp_gained = 50  # Fixed XP for trainer battles
-        xp_result = await db.add_species_xp(
+        xp_result = await db.award_trainer_victory(
             self.user.id, self.guild_id,
+            self.wild_pokemon, self.is_shiny, self.trainer['reward_money'],
             self.user_choice['pokemon_id'], self.user_choice['pokemon_name'],
-            xp_gained, is_win=True
+            xp_gained
         )
 
         # Update quest progress for defeating wild trainer
@@ -914,9 +916,7 @@ class TrainerBattleView(View):
             await db.add_currency(self.user.id, self.guild_id, quest_result['total_currency'])
 
         # Clear battle state from bot module
-        import bot
-        if self.user.id in bot.active_trainer_battles:
-            del bot.active_trainer_battles[self.user.id]
+        self._active_battles.pop(self.user.id, None)
 
         # Create victory embed
         embed = discord.Embed(
@@ -955,9 +955,7 @@ class TrainerBattleView(View):
     async def handle_defeat(self, interaction: discord.Interaction):
         """Handle battle defeat"""
         # Clear battle state from bot module
-        import bot
-        if self.user.id in bot.active_trainer_battles:
-            del bot.active_trainer_battles[self.user.id]
+        self._active_battles.pop(self.user.id, None)
 
         # Create defeat embed
         embed = discord.Embed(
@@ -987,9 +985,7 @@ class TrainerBattleView(View):
         await interaction.response.defer()
 
         # Clear battle state from bot module
-        import bot
-        if self.user.id in bot.active_trainer_battles:
-            del bot.active_trainer_battles[self.user.id]
+        self._active_battles.pop(self.user.id, None)
 
         # Create flee embed
         embed = discord.Embed(
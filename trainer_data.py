@@ -6,6 +6,10 @@ Includes battle quotes for flavor text
 """
 
 import random
+from collections import OrderedDict
+from types import MappingProxyType
+
+_random = random.random
 
 # Generic battle quotes by trainer class
 TRAINER_QUOTES = {
@@ -343,18 +347,100 @@ TRAINERS = [
 ]
 
 
-def get_random_trainer():
-    """Get a random trainer from the list with a random battle quote"""
-    trainer = random.choice(TRAINERS).copy()
+# Trainer templates are shared by every encounter, so freeze them into read-only views
+TRAINERS = tuple(
+    MappingProxyType(dict(trainer, pokemon_ids=tuple(trainer['pokemon_ids'])))
+    for trainer in TRAINERS
+)
 
-    # Add a random quote based on their class
-    trainer_class = trainer['class']
-    if trainer_class in TRAINER_QUOTES:
-        trainer['quote'] = random.choice(TRAINER_QUOTES[trainer_class])
+
+# Trainer levels are capped here (see get_trainer_team)
+MAX_TRAINER_LEVEL = 50
+
+# How many of the closest trainers a level-matched encounter picks from when none covers the level
+TRAINER_POOL_SIZE = 6
+
+
+def _level_distance(trainer, level):
+    """How far a level is outside a trainer's level range (0 if inside)"""
+    min_level, max_level = trainer['level_range']
+    return max(min_level - level, level - max_level, 0)
+
+
+def _build_level_pool(level):
+    """Every trainer whose level range covers the level, else the nearest ones (ties at the cutoff included)"""
+    pool = tuple(trainer for trainer in TRAINERS if _level_distance(trainer, level) == 0)
+    if pool:
+        return pool
+    cutoff = sorted(_level_distance(trainer, level) for trainer in TRAINERS)[TRAINER_POOL_SIZE - 1]
+    return tuple(trainer for trainer in TRAINERS if _level_distance(trainer, level) <= cutoff)
+
+
+# Trainer pools by user level, precomputed so a level-matched pick is a single random.choice
+_TRAINERS_BY_LEVEL = tuple(_build_level_pool(level) for level in range(MAX_TRAINER_LEVEL + 1))
+
+# Every trainer must be reachable from at least one level
+assert {id(trainer) for pool in _TRAINERS_BY_LEVEL for trainer in pool} == {id(trainer) for trainer in TRAINERS}, \
+    "Some trainers are not in any level pool"
+
+
+# Most users whose trainer order is remembered - the least recently seen are forgotten first
+MAX_TRAINER_BAGS = 10000
+
+# Each user's shuffled trainer order for their current pool: {user_id: (pool_key, order, position)}
+# pool_key is the level pool (None for all trainers) and order is a tuple permutation of pool indices
+_trainer_bags = OrderedDict()
+
+
+def _trainer_pool(pool_key):
+    """The trainers a pool key draws from"""
+    return TRAINERS if pool_key is None else _TRAINERS_BY_LEVEL[pool_key]
+
+
+def _draw_trainer(user_id, pool_key):
+    """Draw the user's next trainer from a shuffled order of their pool
+
+    No trainer repeats until the whole pool has appeared. Switching to another pool starts a new
+    order, which only avoids opening with the trainer the user just met
+    """
+    pool = _trainer_pool(pool_key)
+    state = _trainer_bags.pop(user_id, None)  # Re-inserted below as the most recently seen user
+    if state is not None and state[0] == pool_key and state[2] < len(state[1]):
+        _, order, position = state
     else:
-        trainer['quote'] = "Let's battle!"
+        order = list(range(len(pool)))
+        random.shuffle(order)
+        # Don't open the new order with the trainer the user just met
+        if state is not None and len(order) > 1:
+            last_pool_key, last_order, last_position = state
+            if pool[order[0]] is _trainer_pool(last_pool_key)[last_order[last_position - 1]]:
+                order[0], order[-1] = order[-1], order[0]
+        order, position = tuple(order), 0
+
+    _trainer_bags[user_id] = (pool_key, order, position + 1)
+    if len(_trainer_bags) > MAX_TRAINER_BAGS:
+        _trainer_bags.popitem(last=False)
+    return pool[order[position]]
 
-    return trainer
+
+def get_random_trainer(user_level=None, user_id=None):
+    """Get a random trainer (near user_level if given) with a random battle quote
+
+    With a user_id, trainers don't repeat for that user until their whole pool has appeared, as long
+    as they keep drawing from the same pool - pass a level that is stable per user (e.g. their average)
+    """
+    pool_key = None if user_level is None else min(MAX_TRAINER_LEVEL, max(0, int(user_level)))
+    if user_id is None:
+        trainer = random.choice(_trainer_pool(pool_key))
+    else:
+        trainer = _draw_trainer(user_id, pool_key)
+
+    # Add a random quote based on their class
+    quotes = TRAINER_QUOTES.get(trainer['class'])
+    quote = random.choice(quotes) if quotes else "Let's battle!"
+
+    # Copy the template once, with the quote, so callers get a dict of their own
+    return dict(trainer, quote=quote)
 
 
 def get_trainer_team(trainer, user_level_avg=15):
@@ -374,15 +460,12 @@ def get_trainer_team(trainer, user_level_avg=15):
     # Scale trainer levels to be slightly below user's average
     # This makes them challenging but not impossible
     level_adjustment = max(0, user_level_avg - 15)
-    min_level = min(50, min_level + level_adjustment)
-    max_level = min(50, max_level + level_adjustment)
-
-    team = []
-    for pokemon_id in trainer['pokemon_ids']:
-        level = random.randint(min_level, max_level)
-        team.append({
-            'pokemon_id': pokemon_id,
-            'level': level
-        })
-
-    return team
+    min_level = min(MAX_TRAINER_LEVEL, min_level + level_adjustment)
+    max_level = min(MAX_TRAINER_LEVEL, max_level + level_adjustment)
+
+    # One random() per Pokemon instead of randint's range checks
+    span = max_level - min_level + 1
+    return [
+        {'pokemon_id': pokemon_id, 'level': min_level + int(_random() * span)}
+        for pokemon_id in trainer['pokemon_ids']
+    ]
@@ -5,6 +5,7 @@ This allows ON CONFLICT (item_name) DO NOTHING to work properly
 import asyncpg
 import os
 import asyncio
+import traceback
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -61,14 +62,13 @@ async def add_constraint():
             }.get(c['contype'], c['contype'])
             print(f"  {c['conname']}: {constraint_type}")
 
-        await conn.close()
         print("\nMigration complete!")
         print("Restart your bot to populate shop items.")
 
     except Exception as e:
         print(f"\nMigration failed: {e}")
-        import traceback
         traceback.print_exc()
+    finally:
         await conn.close()
 
 if __name__ == "__main__":
@@ -18,7 +18,12 @@ async def check_shop():
     conn = await asyncpg.connect(database_url)
 
     # Get all shop items
-    items = await conn.fetch('SELECT * FROM shop_items ORDER BY price ASC')
+    # Only the printed columns - pack_config is reduced to a flag instead of sending the JSON
+    items = await conn.fetch('''
+        SELECT id, item_name, item_type, price, is_active, pack_config IS NOT NULL AS has_pack_config
+        FROM shop_items
+        ORDER BY price ASC
+    ''')
 
     print(f"\nTotal shop items in database: {len(items)}\n")
     print("="*60)
@@ -28,7 +33,7 @@ async def check_shop():
         print(f"  ID: {item['id']}")
         print(f"  Type: {item['item_type']}")
         print(f"  Active: {item['is_active']}")
-        print(f"  Has pack_config: {item['pack_config'] is not None}")
+        print(f"  Has pack_config: {item['has_pack_config']}")
         print()
 
     await conn.close()
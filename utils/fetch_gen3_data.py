@@ -9,76 +9,164 @@ PokeAPI is licensed under BSD 3-Clause License
 import aiohttp
 import asyncio
 import json
-from typing import Dict
+import random
+from typing import Dict, Optional, Tuple
 import os
 
+try:
+    import orjson
+except ImportError:  # orjson is optional - the stdlib json module is just slower
+    orjson = None
+
 # Gen 3 Pokemon IDs (252-386) - Hoenn region
 GEN3_POKEMON = list(range(252, 387))
 
-async def fetch_pokemon_data(session: aiohttp.ClientSession, pokemon_id: int) -> Dict:
-    """Fetch complete Pokemon data from PokeAPI"""
+# Max PokeAPI requests in flight at once - concurrent, but still polite to the API
+MAX_CONCURRENT_REQUESTS = 10
+
+# Attempts per URL when PokeAPI rate-limits us (429) or has a server error (5xx)
+MAX_ATTEMPTS = 5
+
+# Move details by PokeAPI URL, kept between runs (moves are shared by many Pokemon)
+MOVE_CACHE_FILE = 'move_cache.json'
+
+
+async def get_json(session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, url: str) -> Tuple[int, Optional[Dict]]:
+    """GET a PokeAPI URL, retrying 429/5xx with backoff. Returns (status, data), data is None on failure"""
+    for attempt in range(MAX_ATTEMPTS):
+        async with semaphore:
+            async with session.get(url) as resp:
+                if resp.status == 200:
+                    return resp.status, await resp.json()
+                status = resp.status
+                retry_after = resp.headers.get('Retry-After', '')
+
+        if status != 429 and status < 500:
+            return status, None  # Not something a retry will fix (e.g. 404)
+        if attempt == MAX_ATTEMPTS - 1:
+            break
+
+        # Wait outside the semaphore so other requests keep going
+        if status == 429 and retry_after.isdigit():
+            delay = int(retry_after)
+        else:
+            delay = 2 ** attempt + random.random()
+        print(f"PokeAPI returned {status} for {url}, retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+    return status, None
+
+
+async def request_move(session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, url: str) -> Optional[Dict]:
+    """Request one move from PokeAPI, keeping only the fields battles use"""
+    _, move_details = await get_json(session, semaphore, url)
+    if move_details is None:
+        return None
+
+    return {
+        'name': move_details['name'],
+        'power': move_details['power'],
+        'accuracy': move_details['accuracy'],
+        'pp': move_details['pp'],
+        'type': move_details['type']['name'],
+        'damage_class': move_details['damage_class']['name']
+    }
+
+
+async def fetch_move_details(session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, move_cache: Dict, move: Dict) -> Optional[Dict]:
+    """Fetch the battle details of one level-up move, requesting each move URL at most once"""
+    url = move['url']
     try:
-        async with session.get(f'https://pokeapi.co/api/v2/pokemon/{pokemon_id}') as resp:
-            if resp.status != 200:
-                print(f"Failed to fetch Pokemon {pokemon_id}: {resp.status}")
+        details = move_cache.get(url)
+        if details is None:
+            # Every Pokemon that learns this move awaits the same request
+            details = move_cache[url] = asyncio.ensure_future(request_move(session, semaphore, url))
+        if isinstance(details, asyncio.Future):
+            try:
+                details = await details
+            except Exception:
+                move_cache.pop(url, None)  # Let a later Pokemon retry it
+                raise
+            if details is None:
+                move_cache.pop(url, None)
                 return None
+            move_cache[url] = details
+
+        return dict(details, learn_level=move['learn_level'])
+    except Exception as e:
+        print(f"Failed to fetch move {move['name']}: {e}")
+        return None
 
-            data = await resp.json()
-
-            # Extract only what we need
-            pokemon_data = {
-                'id': data['id'],
-                'name': data['name'],
-                'types': [t['type']['name'] for t in data['types']],
-                'stats': {stat['stat']['name']: stat['base_stat'] for stat in data['stats']},
-                'sprites': {
-                    'front_default': data['sprites']['front_default'],
-                    'front_shiny': data['sprites']['front_shiny']
-                },
-                'moves': []
-            }
-
-            # Get level-up moves only (for battles)
-            level_up_moves = []
-            for move_data in data['moves']:
-                for version_detail in move_data['version_group_details']:
-                    if version_detail['move_learn_method']['name'] == 'level-up':
-                        level_up_moves.append({
-                            'name': move_data['move']['name'],
-                            'url': move_data['move']['url'],
-                            'learn_level': version_detail['level_learned_at']
-                        })
-                        break
-
-            # Fetch move details (in batches to avoid overwhelming the API)
-            for move in level_up_moves[:30]:  # Limit to 30 moves per Pokemon
-                try:
-                    async with session.get(move['url']) as move_resp:
-                        if move_resp.status == 200:
-                            move_details = await move_resp.json()
-                            pokemon_data['moves'].append({
-                                'name': move_details['name'],
-                                'power': move_details['power'],
-                                'accuracy': move_details['accuracy'],
-                                'pp': move_details['pp'],
-                                'type': move_details['type']['name'],
-                                'damage_class': move_details['damage_class']['name'],
-                                'learn_level': move['learn_level']
-                            })
-                    # Small delay to be nice to the API
-                    await asyncio.sleep(0.1)
-                except Exception as e:
-                    print(f"Failed to fetch move {move['name']}: {e}")
-                    continue
-
-            print(f"[OK] Fetched {data['name'].title()} ({pokemon_id}/386) with {len(pokemon_data['moves'])} moves")
-            return pokemon_data
+
+async def fetch_pokemon_data(session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, move_cache: Dict, pokemon_id: int) -> Dict:
+    """Fetch complete Pokemon data from PokeAPI"""
+    try:
+        status, data = await get_json(session, semaphore, f'https://pokeapi.co/api/v2/pokemon/{pokemon_id}')
+        if data is None:
+            print(f"Failed to fetch Pokemon {pokemon_id}: {status}")
+            return None
+
+        # Extract only what we need
+        pokemon_data = {
+            'id': data['id'],
+            'name': data['name'],
+            'types': [t['type']['name'] for t in data['types']],
+            'stats': {stat['stat']['name']: stat['base_stat'] for stat in data['stats']},
+            'sprites': {
+                'front_default': data['sprites']['front_default'],
+                'front_shiny': data['sprites']['front_shiny']
+            },
+            'moves': []
+        }
+
+        # Get level-up moves only (for battles)
+        level_up_moves = []
+        for move_data in data['moves']:
+            for version_detail in move_data['version_group_details']:
+                if version_detail['move_learn_method']['name'] == 'level-up':
+                    level_up_moves.append({
+                        'name': move_data['move']['name'],
+                        'url': move_data['move']['url'],
+                        'learn_level': version_detail['level_learned_at']
+                    })
+                    break
+
+        # Fetch move details concurrently (gather keeps them in learnset order)
+        moves = await asyncio.gather(*(
+            fetch_move_details(session, semaphore, move_cache, move)
+            for move in level_up_moves[:30]  # Limit to 30 moves per Pokemon
+        ))
+        pokemon_data['moves'] = [move for move in moves if move is not None]
+
+        print(f"[OK] Fetched {data['name'].title()} ({pokemon_id}/386) with {len(pokemon_data['moves'])} moves")
+        return pokemon_data
 
     except Exception as e:
         print(f"Error fetching Pokemon {pokemon_id}: {e}")
         return None
 
 
+def load_pokemon_file(path: str) -> Dict:
+    """Read the Pokemon data file"""
+    if orjson:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_pokemon_file(path: str, all_pokemon: Dict) -> int:
+    """Write the Pokemon data file (2-space indented, the layout the bot indexes) and return its size in bytes"""
+    if orjson:
+        data = orjson.dumps(all_pokemon, option=orjson.OPT_INDENT_2)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return len(data)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(all_pokemon, f, indent=2)
+        return f.tell()  # Size of what was just written - no second serialization needed
+
+
 async def main():
     """Fetch all Gen 3 Pokemon data and append to existing file"""
     print("Fetching Gen 3 Pokemon data from PokeAPI...")
@@ -87,29 +175,44 @@ async def main():
     # Load existing Pokemon data
     data_file = 'pokemon_data.json'
     if os.path.exists(data_file):
-        with open(data_file, 'r', encoding='utf-8') as f:
-            all_pokemon = json.load(f)
+        all_pokemon = load_pokemon_file(data_file)
         print(f"Loaded existing data with {len(all_pokemon)} Pokemon\n")
     else:
         print("Warning: pokemon_data.json not found, creating new file")
         all_pokemon = {}
 
-    async with aiohttp.ClientSession() as session:
-        # Fetch Pokemon one by one to avoid rate limiting
-        for pokemon_id in GEN3_POKEMON:
-            pokemon_data = await fetch_pokemon_data(session, pokemon_id)
-            if pokemon_data:
-                all_pokemon[str(pokemon_id)] = pokemon_data
-
-            # Delay between Pokemon to be nice to the API
-            await asyncio.sleep(0.5)
+    # Load move details cached by earlier runs
+    move_cache = {}
+    if os.path.exists(MOVE_CACHE_FILE):
+        with open(MOVE_CACHE_FILE, 'r', encoding='utf-8') as f:
+            move_cache = json.load(f)
+        print(f"Loaded {len(move_cache)} cached moves\n")
+
+    # Created inside the running loop (module-level semaphores bind to the wrong loop on 3.8/3.9)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    # One pooled session for every request: keep-alive connections and cached DNS for pokeapi.co
+    connector = aiohttp.TCPConnector(limit=MAX_CONCURRENT_REQUESTS, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=30)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        # Fetch all Pokemon concurrently - the semaphore bounds how many requests hit the API at once
+        results = await asyncio.gather(*(
+            fetch_pokemon_data(session, semaphore, move_cache, pokemon_id) for pokemon_id in GEN3_POKEMON
+        ))
+
+    # Only finished lookups are left in the cache once every fetch has completed
+    with open(MOVE_CACHE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(move_cache, f)
+
+    for pokemon_id, pokemon_data in zip(GEN3_POKEMON, results):
+        if pokemon_data:
+            all_pokemon[str(pokemon_id)] = pokemon_data
 
     # Save to JSON file
-    with open(data_file, 'w', encoding='utf-8') as f:
-        json.dump(all_pokemon, f, indent=2)
+    file_size = save_pokemon_file(data_file, all_pokemon)
 
     print(f"\n[SUCCESS] Saved {len(all_pokemon)} Pokemon to {data_file}")
-    print(f"File size: {len(json.dumps(all_pokemon)) / 1024:.2f} KB")
+    print(f"File size: {file_size / 1024:.2f} KB")
     print(f"Gen 3 Pokemon added: {len(GEN3_POKEMON)}")
 
 
@@ -9,99 +9,160 @@ PokeAPI is licensed under BSD 3-Clause License
 import aiohttp
 import asyncio
 import json
-from typing import Dict, List
+from typing import Dict, Optional
+
+try:
+    import orjson
+except ImportError:  # orjson is optional - the stdlib json module is just slower
+    orjson = None
 
 # Gen 1 Pokemon IDs (1-151)
 GEN1_POKEMON = list(range(1, 152))
 
-async def fetch_pokemon_data(session: aiohttp.ClientSession, pokemon_id: int) -> Dict:
+# Max PokeAPI requests in flight at once - concurrent, but still polite to the API
+MAX_CONCURRENT_REQUESTS = 10
+
+
+async def request_move(session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, url: str) -> Optional[Dict]:
+    """Request one move from PokeAPI, keeping only the fields battles use"""
+    async with semaphore:
+        async with session.get(url) as move_resp:
+            if move_resp.status != 200:
+                return None
+            move_details = await move_resp.json()
+
+    return {
+        'name': move_details['name'],
+        'power': move_details['power'],
+        'accuracy': move_details['accuracy'],
+        'pp': move_details['pp'],
+        'type': move_details['type']['name'],
+        'damage_class': move_details['damage_class']['name']
+    }
+
+
+async def fetch_move_details(session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, move_cache: Dict, move: Dict) -> Optional[Dict]:
+    """Fetch the battle details of one level-up move, requesting each move URL at most once"""
+    url = move['url']
+    details = move_cache.get(url)
+    if details is None:
+        # Every Pokemon that learns this move awaits the same request
+        details = move_cache[url] = asyncio.ensure_future(request_move(session, semaphore, url))
+    if isinstance(details, asyncio.Future):
+        try:
+            details = await details
+        except Exception:
+            move_cache.pop(url, None)  # Let a later Pokemon retry it
+            raise
+        if details is None:
+            move_cache.pop(url, None)
+            return None
+        move_cache[url] = details
+
+    return dict(details, learn_level=move['learn_level'])
+
+
+async def fetch_pokemon_data(session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, move_cache: Dict, pokemon_id: int) -> Dict:
     """Fetch complete Pokemon data from PokeAPI"""
     try:
-        async with session.get(f'https://pokeapi.co/api/v2/pokemon/{pokemon_id}') as resp:
-            if resp.status != 200:
-                print(f"Failed to fetch Pokemon {pokemon_id}: {resp.status}")
-                return None
-
-            data = await resp.json()
-
-            # Extract only what we need
-            pokemon_data = {
-                'id': data['id'],
-                'name': data['name'],
-                'types': [t['type']['name'] for t in data['types']],
-                'stats': {stat['stat']['name']: stat['base_stat'] for stat in data['stats']},
-                'sprites': {
-                    'front_default': data['sprites']['front_default'],
-                    'front_shiny': data['sprites']['front_shiny']
-                },
-                'moves': []
-            }
-
-            # Get level-up moves only (for battles)
-            level_up_moves = []
-            for move_data in data['moves']:
-                for version_detail in move_data['version_group_details']:
-                    if version_detail['move_learn_method']['name'] == 'level-up':
-                        level_up_moves.append({
-                            'name': move_data['move']['name'],
-                            'url': move_data['move']['url'],
-                            'learn_level': version_detail['level_learned_at']
-                        })
-                        break
-
-            # Fetch move details (in batches to avoid overwhelming the API)
-            for move in level_up_moves[:30]:  # Limit to 30 moves per Pokemon
-                try:
-                    async with session.get(move['url']) as move_resp:
-                        if move_resp.status == 200:
-                            move_details = await move_resp.json()
-                            pokemon_data['moves'].append({
-                                'name': move_details['name'],
-                                'power': move_details['power'],
-                                'accuracy': move_details['accuracy'],
-                                'pp': move_details['pp'],
-                                'type': move_details['type']['name'],
-                                'damage_class': move_details['damage_class']['name'],
-                                'learn_level': move['learn_level']
-                            })
-                    # Small delay to be nice to the API
-                    await asyncio.sleep(0.1)
-                except Exception as e:
-                    print(f"Failed to fetch move {move['name']}: {e}")
-                    continue
-
-            print(f"[OK] Fetched {data['name'].title()} ({pokemon_id}/151) with {len(pokemon_data['moves'])} moves")
-            return pokemon_data
+        # Hold the semaphore per request only - the move fetches below need it too
+        async with semaphore:
+            async with session.get(f'https://pokeapi.co/api/v2/pokemon/{pokemon_id}') as resp:
+                if resp.status != 200:
+                    print(f"Failed to fetch Pokemon {pokemon_id}: {resp.status}")
+                    return None
+
+                data = await resp.json()
+
+        # Extract only what we need
+        pokemon_data = {
+            'id': data['id'],
+            'name': data['name'],
+            'types': [t['type']['name'] for t in data['types']],
+            'stats': {stat['stat']['name']: stat['base_stat'] for stat in data['stats']},
+            'sprites': {
+                'front_default': data['sprites']['front_default'],
+                'front_shiny': data['sprites']['front_shiny']
+            },
+            'moves': []
+        }
+
+        # Get level-up moves only (for battles)
+        level_up_moves = []
+        for move_data in data['moves']:
+            for version_detail in move_data['version_group_details']:
+                if version_detail['move_learn_method']['name'] == 'level-up':
+                    level_up_moves.append({
+                        'name': move_data['move']['name'],
+                        'url': move_data['move']['url'],
+                        'learn_level': version_detail['level_learned_at']
+                    })
+                    break
+
+        # Fetch move details concurrently (gather keeps them in learnset order)
+        moves = level_up_moves[:30]  # Limit to 30 moves per Pokemon
+        results = await asyncio.gather(
+            *(fetch_move_details(session, semaphore, move_cache, move) for move in moves),
+            return_exceptions=True
+        )
+        for move, result in zip(moves, results):
+            if isinstance(result, Exception):
+                print(f"Failed to fetch move {move['name']}: {result}")
+            elif result is not None:
+                pokemon_data['moves'].append(result)
+
+        print(f"[OK] Fetched {data['name'].title()} ({pokemon_id}/151) with {len(pokemon_data['moves'])} moves")
+        return pokemon_data
 
     except Exception as e:
         print(f"Error fetching Pokemon {pokemon_id}: {e}")
         return None
 
 
+def save_pokemon_file(path: str, all_pokemon: Dict) -> int:
+    """Write the Pokemon data file (2-space indented, the layout the bot indexes) and return its size in bytes"""
+    if orjson:
+        data = orjson.dumps(all_pokemon, option=orjson.OPT_INDENT_2)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return len(data)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(all_pokemon, f, indent=2)
+        return f.tell()  # Size of what was just written - no second serialization needed
+
+
 async def main():
     """Fetch all Gen 1 Pokemon data"""
     print("Fetching Gen 1 Pokemon data from PokeAPI...")
     print("This will take a few minutes...\n")
 
-    all_pokemon = {}
+    # Move details by PokeAPI URL - moves are shared by many Pokemon, so each is fetched once
+    move_cache = {}
 
-    async with aiohttp.ClientSession() as session:
-        # Fetch Pokemon one by one to avoid rate limiting
-        for pokemon_id in GEN1_POKEMON:
-            pokemon_data = await fetch_pokemon_data(session, pokemon_id)
-            if pokemon_data:
-                all_pokemon[str(pokemon_id)] = pokemon_data
+    # Created inside the running loop (module-level semaphores bind to the wrong loop on 3.8/3.9)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
 
-            # Delay between Pokemon to be nice to the API
-            await asyncio.sleep(0.5)
+    # One pooled session for every request: keep-alive connections and cached DNS for pokeapi.co
+    connector = aiohttp.TCPConnector(limit=MAX_CONCURRENT_REQUESTS, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=30)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        # Fetch all Pokemon concurrently - the semaphore bounds how many requests hit the API at once
+        results = await asyncio.gather(*(
+            fetch_pokemon_data(session, semaphore, move_cache, pokemon_id) for pokemon_id in GEN1_POKEMON
+        ))
+
+    all_pokemon = {
+        str(pokemon_id): pokemon_data
+        for pokemon_id, pokemon_data in zip(GEN1_POKEMON, results)
+        if pokemon_data
+    }
 
     # Save to JSON file
     output_file = 'pokemon_data.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(all_pokemon, f, indent=2)
+    file_size = save_pokemon_file(output_file, all_pokemon)
 
     print(f"\n[SUCCESS] Saved {len(all_pokemon)} Pokemon to {output_file}")
-    print(f"File size: {len(json.dumps(all_pokemon)) / 1024:.2f} KB")
+    print(f"File size: {file_size / 1024:.2f} KB")
 
 
 if __name__ == '__main__':
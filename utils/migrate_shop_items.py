@@ -4,7 +4,7 @@ import asyncio
 
 
 async def migrate_database():
-    """Add pack_config column to shop_items table"""
+    """Add pack_config column to shop_items table and normalize stored configs"""
     database_url = os.getenv('DATABASE_URL')
 
     if not database_url:
@@ -16,28 +16,23 @@ async def migrate_database():
         conn = await asyncpg.connect(database_url)
         print("Connected to database")
 
-        # Check if column exists
-        column_exists = await conn.fetchval('''
-            SELECT EXISTS (
-                SELECT 1
-                FROM information_schema.columns
-                WHERE table_name = 'shop_items'
-                AND column_name = 'pack_config'
-            )
+        # Add the column (no-op if it already exists)
+        print("Ensuring 'pack_config' column exists in shop_items table...")
+        await conn.execute('''
+            ALTER TABLE shop_items
+            ADD COLUMN IF NOT EXISTS pack_config JSONB
         ''')
-
-        if column_exists:
-            print("Column 'pack_config' already exists in shop_items table")
-        else:
-            print("Adding 'pack_config' column to shop_items table...")
-
-            # Add the column
-            await conn.execute('''
-                ALTER TABLE shop_items
-                ADD COLUMN pack_config JSONB
+        print("Column ready!")
+
+        # Unwrap configs that were stored as JSON strings inside the JSONB column
+        # so the bot always gets a dict back without re-parsing
+        for table in ('shop_items', 'user_packs'):
+            result = await conn.execute(f'''
+                UPDATE {table}
+                SET pack_config = (pack_config #>> '{{}}')::jsonb
+                WHERE jsonb_typeof(pack_config) = 'string'
             ''')
-
-            print("Column added successfully!")
+            print(f"Normalized pack_config in {table}: {result}")
 
         # Close connection
         await conn.close()
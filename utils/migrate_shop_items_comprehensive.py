@@ -4,7 +4,7 @@ Comprehensive database migration script for shop_items table.
 This script will:
 1. Check if pack_config column exists in shop_items table
 2. Add the column if it doesn't exist
-3. Update all existing shop items with their proper pack configurations
+3. Insert or update every shop item with its proper pack configuration
 4. Verify the migration was successful
 
 Usage:
@@ -13,13 +13,13 @@ Usage:
 Requirements:
     - DATABASE_URL environment variable must be set
     - Database must be accessible
+    - shop_items.item_name must be UNIQUE (see add_unique_constraint.py for older databases)
 """
 
 import asyncpg
 import os
 import asyncio
 import json
-from typing import Dict, List, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -76,6 +76,28 @@ PACK_CONFIGS = {
 }
 
 
+# Default shop items: (item_type, item_name, description, price)
+SHOP_ITEMS_DATA = (
+    ('pack', 'Basic Pack', 'Standard pack with a few random Pokemon', 100),
+    ('pack', 'Booster Pack', 'Enhanced pack with better odds and more Pokemon!', 250),
+    ('pack', 'Premium Pack', 'Premium pack with guaranteed rare Pokemon and excellent shiny odds!', 500),
+    ('pack', 'Elite Trainer Pack', 'Elite pack for serious trainers! Multiple guaranteed rares with amazing shiny rates!', 1000),
+    ('pack', 'Master Collection', 'Ultimate pack! Guaranteed shiny or multiple legendaries with the best odds!', 2500),
+)
+
+# Upsert-ready rows with their pack_config, built once for the items that have one
+SHOP_ITEM_ROWS = tuple(
+    (item_type, item_name, description, price, PACK_CONFIGS[item_name])
+    for item_type, item_name, description, price in SHOP_ITEMS_DATA
+    if item_name in PACK_CONFIGS
+)
+
+
+async def init_connection(conn: asyncpg.Connection):
+    """Encode/decode JSONB columns (pack_config) as dicts, like the bot's pool does"""
+    await conn.set_type_codec('jsonb', encoder=json.dumps, decoder=json.loads, schema='pg_catalog')
+
+
 async def check_column_exists(conn: asyncpg.Connection) -> bool:
     """Check if pack_config column exists in shop_items table"""
     exists = await conn.fetchval('''
@@ -111,51 +133,19 @@ async def add_pack_config_column(conn: asyncpg.Connection):
     print("Column added successfully")
 
 
-async def get_existing_shop_items(conn: asyncpg.Connection) -> List[Dict]:
-    """Get all existing shop items"""
-    rows = await conn.fetch('''
-        SELECT id, item_name, item_type, description, price
-        FROM shop_items
-        ORDER BY price ASC
-    ''')
-    return [dict(row) for row in rows]
+async def upsert_shop_items(conn: asyncpg.Connection) -> int:
+    """Insert missing shop items and refresh the pack_config of existing ones in one batch"""
+    for item in SHOP_ITEM_ROWS:
+        print(f"  Upserting '{item[1]}' with pack config")
 
+    # ON CONFLICT does the existence check server-side - no SELECT of existing items needed
+    await conn.executemany('''
+        INSERT INTO shop_items (item_type, item_name, description, price, pack_config)
+        VALUES ($1, $2, $3, $4, $5)
+        ON CONFLICT (item_name) DO UPDATE SET pack_config = EXCLUDED.pack_config
+    ''', SHOP_ITEM_ROWS)
 
-async def update_shop_item_config(conn: asyncpg.Connection, item_id: int, item_name: str, pack_config: Dict):
-    """Update a single shop item with its pack configuration"""
-    await conn.execute('''
-        UPDATE shop_items
-        SET pack_config = $1
-        WHERE id = $2
-    ''', json.dumps(pack_config), item_id)
-    print(f"  Updated '{item_name}' with pack config")
-
-
-async def insert_missing_shop_items(conn: asyncpg.Connection, existing_items: List[Dict]):
-    """Insert any shop items that are missing from the database"""
-    existing_names = {item['item_name'] for item in existing_items}
-
-    shop_items_data = [
-        ('pack', 'Basic Pack', 'Standard pack with a few random Pokemon', 100),
-        ('pack', 'Booster Pack', 'Enhanced pack with better odds and more Pokemon!', 250),
-        ('pack', 'Premium Pack', 'Premium pack with guaranteed rare Pokemon and excellent shiny odds!', 500),
-        ('pack', 'Elite Trainer Pack', 'Elite pack for serious trainers! Multiple guaranteed rares with amazing shiny rates!', 1000),
-        ('pack', 'Master Collection', 'Ultimate pack! Guaranteed shiny or multiple legendaries with the best odds!', 2500),
-    ]
-
-    inserted_count = 0
-    for item_type, item_name, description, price in shop_items_data:
-        if item_name not in existing_names:
-            pack_config = PACK_CONFIGS.get(item_name)
-            if pack_config:
-                await conn.execute('''
-                    INSERT INTO shop_items (item_type, item_name, description, price, pack_config)
-                    VALUES ($1, $2, $3, $4, $5)
-                ''', item_type, item_name, description, price, json.dumps(pack_config))
-                print(f"  Inserted missing item: '{item_name}'")
-                inserted_count += 1
-
-    return inserted_count
+    return len(SHOP_ITEM_ROWS)
 
 
 async def verify_migration(conn: asyncpg.Connection) -> bool:
@@ -182,7 +172,7 @@ async def verify_migration(conn: asyncpg.Connection) -> bool:
 
     print(f"\nAll {len(items)} shop items have pack_config set:")
     for item in items:
-        config = json.loads(item['pack_config']) if isinstance(item['pack_config'], str) else item['pack_config']
+        config = item['pack_config']  # Already a dict via the JSONB codec
         print(f"  - {item['item_name']}: {config['min_pokemon']}-{config['max_pokemon']} Pokemon, "
               f"{config['shiny_chance']*100:.2f}% shiny, {config['legendary_chance']*100:.0f}% legendary")
 
@@ -207,12 +197,13 @@ async def migrate_database():
         print("=" * 60)
 
         # Connect to database
-        print("\n[1/6] Connecting to database...")
+        print("\n[1/5] Connecting to database...")
         conn = await asyncpg.connect(database_url)
+        await init_connection(conn)
         print("Connected successfully")
 
         # Check if table exists
-        print("\n[2/6] Checking if shop_items table exists...")
+        print("\n[2/5] Checking if shop_items table exists...")
         table_exists = await check_table_exists(conn)
         if not table_exists:
             print("ERROR: shop_items table does not exist!")
@@ -221,44 +212,25 @@ async def migrate_database():
             return False
         print("Table exists")
 
-        # Check if column exists
-        print("\n[3/6] Checking if pack_config column exists...")
-        column_exists = await check_column_exists(conn)
+        # Schema change and data updates commit together (or not at all)
+        async with conn.transaction():
+            # Check if column exists
+            print("\n[3/5] Checking if pack_config column exists...")
+            column_exists = await check_column_exists(conn)
 
-        if column_exists:
-            print("Column already exists")
-        else:
-            print("Column does not exist")
-            await add_pack_config_column(conn)
-
-        # Get existing shop items
-        print("\n[4/6] Retrieving existing shop items...")
-        existing_items = await get_existing_shop_items(conn)
-        print(f"Found {len(existing_items)} existing shop items")
-
-        # Update pack configs for existing items
-        print("\n[5/6] Updating pack configurations...")
-        updated_count = 0
-        for item in existing_items:
-            pack_config = PACK_CONFIGS.get(item['item_name'])
-            if pack_config:
-                await update_shop_item_config(conn, item['id'], item['item_name'], pack_config)
-                updated_count += 1
+            if column_exists:
+                print("Column already exists")
             else:
-                print(f"  Warning: No pack config found for '{item['item_name']}'")
-
-        print(f"Updated {updated_count} items")
+                print("Column does not exist")
+                await add_pack_config_column(conn)
 
-        # Insert any missing shop items
-        print("\n[5.5/6] Checking for missing shop items...")
-        inserted = await insert_missing_shop_items(conn, existing_items)
-        if inserted > 0:
-            print(f"Inserted {inserted} missing items")
-        else:
-            print("All shop items already exist")
+            # Insert or update every shop item in one batched statement
+            print("\n[4/5] Upserting shop items with pack configurations...")
+            upserted = await upsert_shop_items(conn)
+            print(f"Upserted {upserted} items")
 
         # Verify migration
-        print("\n[6/6] Verifying migration...")
+        print("\n[5/5] Verifying migration...")
         success = await verify_migration(conn)
 
         # Close connection
@@ -38,11 +38,15 @@ async def wipe_database():
     print("Dropping all tables...")
     print("="*70 + "\n")
 
-    # Drop all tables
-    for table in tables:
-        table_name = table['tablename']
+    # Drop all tables in one statement (one round trip, all-or-nothing)
+    table_names = [table['tablename'] for table in tables]
+    for table_name in table_names:
         print(f"Dropping {table_name}...")
-        await conn.execute(f'DROP TABLE IF EXISTS {table_name} CASCADE')
+    if table_names:
+        # Quote the names so mixed-case or odd table names can't break (or inject into) the statement
+        quoted_names = ', '.join('"' + table_name.replace('"', '""') + '"' for table_name in table_names)
+        async with conn.transaction():
+            await conn.execute(f'DROP TABLE IF EXISTS {quoted_names} CASCADE')
 
     print("\n" + "="*70)
     print("ALL TABLES DELETED!")